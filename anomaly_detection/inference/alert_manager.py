@@ -12,6 +12,12 @@ from email.mime.multipart import MIMEMultipart
 import requests
 from ..utils.logger import LoggerFactory, log_detection_event
 
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except Exception:
+    _ORJSON_AVAILABLE = False
+
 
 class AlertManager:
     """Manager for creating and handling security alerts."""
@@ -295,13 +301,22 @@ class AlertManager:
                 'status': alert['status']
             }
             
-            # Send POST request
-            response = requests.post(
-                url,
-                json=payload,
-                headers=headers,
-                timeout=timeout
-            )
+            # Send POST request; orjson serializes numpy scalars directly
+            # and skips the stdlib encoder on the hot alert path
+            if _ORJSON_AVAILABLE:
+                response = requests.post(
+                    url,
+                    data=orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+                    headers=headers,
+                    timeout=timeout
+                )
+            else:
+                response = requests.post(
+                    url,
+                    json=payload,
+                    headers=headers,
+                    timeout=timeout
+                )
             
             if response.status_code == 200:
                 self.logger.info(f"Webhook notification sent for alert {alert['id']}")
@@ -434,7 +449,14 @@ class AlertManager:
                 alert_copy['timestamp'] = alert_copy['timestamp'].isoformat()
                 alerts_data.append(alert_copy)
             
-            with open(filepath, 'w') as f:
-                json.dump(alerts_data, f, indent=2)
+            if _ORJSON_AVAILABLE:
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(
+                        alerts_data,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                    ))
+            else:
+                with open(filepath, 'w') as f:
+                    json.dump(alerts_data, f, indent=2)
         
         self.logger.info(f"Alerts exported to {filepath}")
\ No newline at end of file
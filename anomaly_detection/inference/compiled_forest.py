@@ -0,0 +1,79 @@
+"""Optional ONNX compilation of fitted sklearn forests for low-latency inference.
+
+sklearn tree ensembles traverse their trees in Python-level loops, which is
+slow for the single-row predictions the realtime path issues per packet.
+When skl2onnx and onnxruntime are installed, a fitted forest can be compiled
+once into an ONNX graph and served through onnxruntime's native tree
+evaluator; otherwise callers fall back to the sklearn model unchanged.
+"""
+
+import numpy as np
+from typing import Optional, Any
+
+from ..utils.logger import LoggerFactory
+
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    import onnxruntime as ort
+    _ONNX_AVAILABLE = True
+except Exception:
+    _ONNX_AVAILABLE = False
+
+
+class CompiledForest:
+    """sklearn-compatible predict/predict_proba facade over an ONNX session."""
+
+    def __init__(self, session, input_name: str):
+        self._session = session
+        self._input_name = input_name
+
+    def _run(self, X):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        return self._session.run(None, {self._input_name: X})
+
+    def predict(self, X) -> np.ndarray:
+        return np.asarray(self._run(X)[0])
+
+    def predict_proba(self, X) -> np.ndarray:
+        return np.asarray(self._run(X)[1])
+
+
+def compile_forest(model: Any, n_features: int) -> Optional[CompiledForest]:
+    """
+    Compile a fitted sklearn classifier to an ONNX inference session.
+
+    Args:
+        model: Fitted sklearn classifier (tree ensembles benefit the most)
+        n_features: Number of input features the model expects
+
+    Returns:
+        CompiledForest wrapper, or None if onnx tooling is unavailable
+        or conversion fails
+    """
+    logger = LoggerFactory.get_logger('CompiledForest')
+
+    if not _ONNX_AVAILABLE:
+        logger.debug("skl2onnx/onnxruntime not installed; using sklearn model directly")
+        return None
+
+    try:
+        onnx_model = convert_sklearn(
+            model,
+            initial_types=[('input', FloatTensorType([None, n_features]))],
+            options={id(model): {'zipmap': False}}
+        )
+        sess_options = ort.SessionOptions()
+        # Single-row latency matters more than throughput on the packet path
+        sess_options.intra_op_num_threads = 1
+        session = ort.InferenceSession(
+            onnx_model.SerializeToString(),
+            sess_options,
+            providers=['CPUExecutionProvider']
+        )
+        input_name = session.get_inputs()[0].name
+        logger.info("Compiled model to ONNX for native tree inference")
+        return CompiledForest(session, input_name)
+    except Exception as e:
+        logger.warning(f"ONNX compilation failed ({e}); using sklearn model directly")
+        return None
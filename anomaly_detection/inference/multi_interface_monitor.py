@@ -1,9 +1,15 @@
 """
 Multi-interface network monitoring module.
 Supports simultaneous monitoring of multiple network interfaces.
+
+Each interface runs in its own process so Python-side feature extraction
+is not serialized by the GIL; workers are pinned to dedicated cores and
+report final statistics to the parent over a queue.
 """
 
-import threading
+import multiprocessing
+import os
+import queue
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from ..utils.logger import LoggerFactory
@@ -11,9 +17,58 @@ from ..persistence.db import DatabaseManager
 from .realtime_detector import RealtimeDetector
 
 
+def _interface_worker(
+    config: Dict[str, Any],
+    model,
+    preprocessor,
+    interface: str,
+    backend: str,
+    packet_count: Optional[int],
+    duration: Optional[int],
+    inject_rate: float,
+    synthetic_delay: float,
+    cpu_id: Optional[int],
+    stats_queue
+):
+    """Capture loop for a single interface; runs in a dedicated process."""
+    if cpu_id is not None and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, {cpu_id})
+        except OSError:
+            pass
+
+    detector = RealtimeDetector(
+        config=config,
+        model=model,
+        preprocessor=preprocessor
+    )
+    status = 'completed'
+    try:
+        detector.start_packet_capture(
+            interface=interface,
+            backend=backend,
+            packet_count=packet_count,
+            duration=duration,
+            inject_rate=inject_rate,
+            synthetic_delay=synthetic_delay
+        )
+    except Exception:
+        status = 'error'
+    finally:
+        stats = detector.stats
+        stats_queue.put({
+            'interface': interface,
+            'status': status,
+            'packets': stats['total_packets'],
+            'anomalies': stats['anomalies_detected'],
+            'alerts': stats['alerts_generated']
+        })
+        detector.close()
+
+
 class MultiInterfaceMonitor:
     """Monitor multiple network interfaces simultaneously."""
-    
+
     def __init__(
         self,
         config: Dict[str, Any],
@@ -24,7 +79,7 @@ class MultiInterfaceMonitor:
     ):
         """
         Initialize multi-interface monitor.
-        
+
         Args:
             config: Configuration dictionary
             model: Trained detection model
@@ -39,12 +94,12 @@ class MultiInterfaceMonitor:
         self.backend = backend
         self.logger = LoggerFactory.get_logger('MultiInterfaceMonitor')
         self.db_manager = DatabaseManager(config)
-        
-        # Detector threads
-        self.detectors = {}
-        self.threads = {}
+
+        # One capture process per interface; stats come back over the queue
+        self.processes: Dict[str, multiprocessing.Process] = {}
+        self._stats_queue = multiprocessing.Queue()
         self.running = False
-        
+
         # Aggregated statistics
         self.aggregate_stats = {
             'total_packets': 0,
@@ -53,7 +108,7 @@ class MultiInterfaceMonitor:
             'interfaces': {},
             'start_time': None
         }
-    
+
     def start_monitoring(
         self,
         packet_count: Optional[int] = None,
@@ -63,7 +118,7 @@ class MultiInterfaceMonitor:
     ):
         """
         Start monitoring all interfaces.
-        
+
         Args:
             packet_count: Optional packet limit per interface
             duration: Optional duration in seconds
@@ -73,112 +128,89 @@ class MultiInterfaceMonitor:
         self.logger.info(f"Starting multi-interface monitoring on: {', '.join(self.interfaces)}")
         self.running = True
         self.aggregate_stats['start_time'] = datetime.now()
-        
-        for interface in self.interfaces:
+
+        n_cpus = os.cpu_count() or 1
+
+        for idx, interface in enumerate(self.interfaces):
             try:
-                # Create detector for this interface
-                detector = RealtimeDetector(
-                    config=self.config,
-                    model=self.model,
-                    preprocessor=self.preprocessor
-                )
-                
                 # Initialize interface stats
                 self.aggregate_stats['interfaces'][interface] = {
                     'packets': 0,
                     'anomalies': 0,
                     'status': 'starting'
                 }
-                
-                # Start detector in separate thread
-                thread = threading.Thread(
-                    target=self._monitor_interface,
-                    args=(interface, detector, packet_count, duration, inject_rate, synthetic_delay),
+
+                # Pin each worker to its own core; the model is mmaped
+                # read-only so forked workers share a single physical copy
+                cpu_id = idx % n_cpus if hasattr(os, 'sched_setaffinity') else None
+                process = multiprocessing.Process(
+                    target=_interface_worker,
+                    args=(
+                        self.config, self.model, self.preprocessor,
+                        interface, self.backend,
+                        packet_count, duration, inject_rate, synthetic_delay,
+                        cpu_id, self._stats_queue
+                    ),
                     name=f"Monitor-{interface}",
                     daemon=True
                 )
-                
-                self.detectors[interface] = detector
-                self.threads[interface] = thread
-                thread.start()
-                
-                self.logger.info(f"Started monitoring on interface: {interface}")
-                
+
+                self.processes[interface] = process
+                process.start()
+                self.aggregate_stats['interfaces'][interface]['status'] = 'active'
+
+                self.logger.info(f"Started monitoring on interface: {interface} (pid={process.pid})")
+
             except Exception as e:
                 self.logger.error(f"Failed to start monitoring on {interface}: {e}")
                 self.aggregate_stats['interfaces'][interface]['status'] = 'error'
-        
-        # Wait for all threads (or until interrupted)
+
+        # Wait for all workers (or until interrupted)
         try:
-            for interface, thread in self.threads.items():
-                thread.join()
+            for interface, process in self.processes.items():
+                process.join()
+            self._drain_stats_queue()
         except KeyboardInterrupt:
             self.logger.info("Monitoring interrupted by user")
             self.stop_monitoring()
-    
-    def _monitor_interface(
-        self,
-        interface: str,
-        detector: RealtimeDetector,
-        packet_count: Optional[int],
-        duration: Optional[int],
-        inject_rate: float,
-        synthetic_delay: float
-    ):
-        """
-        Monitor a single interface (runs in separate thread).
-        
-        Args:
-            interface: Network interface name
-            detector: RealtimeDetector instance
-            packet_count: Optional packet limit
-            duration: Optional duration
-            inject_rate: Synthetic injection rate
-            synthetic_delay: Synthetic packet delay
-        """
-        try:
-            self.aggregate_stats['interfaces'][interface]['status'] = 'active'
-            
-            # Start capture
-            detector.start_packet_capture(
-                interface=interface,
-                backend=self.backend,
-                packet_count=packet_count,
-                duration=duration,
-                inject_rate=inject_rate,
-                synthetic_delay=synthetic_delay
+
+    def _drain_stats_queue(self):
+        """Fold worker-reported statistics into the aggregate."""
+        while True:
+            try:
+                report = self._stats_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            interface = report['interface']
+            iface_stats = self.aggregate_stats['interfaces'].setdefault(
+                interface, {'packets': 0, 'anomalies': 0, 'status': 'unknown'}
             )
-            
-            # Update aggregate stats
-            self.aggregate_stats['interfaces'][interface]['packets'] = detector.stats['total_packets']
-            self.aggregate_stats['interfaces'][interface]['anomalies'] = detector.stats['anomalies_detected']
-            self.aggregate_stats['interfaces'][interface]['status'] = 'completed'
-            
-            self.aggregate_stats['total_packets'] += detector.stats['total_packets']
-            self.aggregate_stats['anomalies_detected'] += detector.stats['anomalies_detected']
-            self.aggregate_stats['alerts_generated'] += detector.stats['alerts_generated']
-            
-        except Exception as e:
-            self.logger.error(f"Error monitoring interface {interface}: {e}")
-            self.aggregate_stats['interfaces'][interface]['status'] = 'error'
-        finally:
-            detector.close()
-    
+            iface_stats['packets'] = report['packets']
+            iface_stats['anomalies'] = report['anomalies']
+            iface_stats['status'] = report['status']
+
+            self.aggregate_stats['total_packets'] += report['packets']
+            self.aggregate_stats['anomalies_detected'] += report['anomalies']
+            self.aggregate_stats['alerts_generated'] += report['alerts']
+
     def stop_monitoring(self):
         """Stop monitoring all interfaces."""
         self.logger.info("Stopping multi-interface monitoring...")
         self.running = False
-        
-        # Close all detectors
-        for interface, detector in self.detectors.items():
+
+        # Stop all capture processes
+        for interface, process in self.processes.items():
             try:
-                detector.running = False
-                detector.close()
+                if process.is_alive():
+                    process.terminate()
+                process.join(timeout=5)
             except Exception as e:
-                self.logger.error(f"Error stopping detector for {interface}: {e}")
-        
+                self.logger.error(f"Error stopping worker for {interface}: {e}")
+
+        self._drain_stats_queue()
         self.print_aggregate_statistics()
-    
+
     def print_aggregate_statistics(self):
         """Print aggregated statistics from all interfaces."""
         print(f"\n{'='*70}")
@@ -187,19 +219,19 @@ class MultiInterfaceMonitor:
         print(f"Total Packets Processed: {self.aggregate_stats['total_packets']}")
         print(f"Total Anomalies Detected: {self.aggregate_stats['anomalies_detected']}")
         print(f"Total Alerts Generated: {self.aggregate_stats['alerts_generated']}")
-        
+
         if self.aggregate_stats['total_packets'] > 0:
             rate = (self.aggregate_stats['anomalies_detected'] / self.aggregate_stats['total_packets']) * 100
             print(f"Overall Anomaly Rate: {rate:.2f}%")
-        
+
         if self.aggregate_stats['start_time']:
             runtime = datetime.now() - self.aggregate_stats['start_time']
             print(f"Runtime: {runtime}")
-        
+
         print(f"\n{'-'*70}")
         print("Per-Interface Statistics:")
         print(f"{'-'*70}")
-        
+
         for interface, stats in self.aggregate_stats['interfaces'].items():
             print(f"\n  Interface: {interface}")
             print(f"    Status: {stats['status']}")
@@ -208,21 +240,21 @@ class MultiInterfaceMonitor:
             if stats['packets'] > 0:
                 iface_rate = (stats['anomalies'] / stats['packets']) * 100
                 print(f"    Anomaly Rate: {iface_rate:.2f}%")
-        
+
         print(f"\n{'='*70}\n")
-    
+
     def get_interface_statistics(self, interface: str) -> Optional[Dict[str, Any]]:
         """
         Get statistics for a specific interface.
-        
+
         Args:
             interface: Network interface name
-            
+
         Returns:
             Statistics dictionary or None if interface not found
         """
         return self.aggregate_stats['interfaces'].get(interface)
-    
+
     def get_aggregate_statistics(self) -> Dict[str, Any]:
         """Get aggregated statistics from all interfaces."""
         return self.aggregate_stats.copy()
@@ -9,6 +9,10 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Leave one core free for capture/IO threads; must be set before sklearn
+# (and its OpenMP runtime) is imported.
+os.environ.setdefault('OMP_NUM_THREADS', str(max(1, (os.cpu_count() or 2) - 1)))
+
 from anomaly_detection.utils.config import load_config
 from anomaly_detection.utils.logger import LoggerFactory
 from anomaly_detection.data_processing.loader import DataLoader
@@ -19,6 +23,7 @@ from anomaly_detection.training.evaluator import ModelEvaluator
 from anomaly_detection.visualization.dashboard import AnomalyDashboard
 from anomaly_detection.inference.realtime_detector import RealtimeDetector
 from anomaly_detection.inference.multi_interface_monitor import MultiInterfaceMonitor
+from anomaly_detection.inference.compiled_forest import compile_forest
 import joblib
 import numpy as np
 from anomaly_detection.monitoring.automated_monitor import AutomatedMonitor
@@ -139,10 +144,66 @@ def evaluate_models(config, X_test, y_test, trainer):
     logger.info(f"\nBest Model: {best_model} with F1-Score: {best_score:.4f}")
 
 
+def _load_fitted_preprocessor(config, logger):
+    """
+    Load a cached fitted preprocessor, refitting from NSL-KDD on cache miss.
+
+    Fitting the preprocessor dominates cold-start time for detection runs,
+    so the fitted instance is cached under the model save directory and
+    reused on subsequent invocations.
+
+    Args:
+        config: Configuration dictionary
+        logger: Logger instance
+
+    Returns:
+        Fitted DataPreprocessor, or None if no cache exists and the
+        training dataset is unavailable
+    """
+    scaling_method = config.get('features', {}).get('scaling_method', 'standard')
+    cache_path = os.path.join(
+        config.get('model_storage', {}).get('save_dir', 'saved_models'),
+        'preprocessor.joblib'
+    )
+
+    if os.path.exists(cache_path):
+        try:
+            preprocessor = joblib.load(cache_path)
+            if getattr(preprocessor, 'fitted', False) and preprocessor.scaling_method == scaling_method:
+                logger.info(f"Loaded cached preprocessor from {cache_path}")
+                return preprocessor
+            logger.warning("Cached preprocessor is stale; refitting from training data")
+        except Exception as e:
+            logger.warning(f"Failed to load cached preprocessor ({e}); refitting")
+
+    data_loader = DataLoader(config.get('data', {}).get('raw_data_path', 'data/raw'))
+    try:
+        train_data, _ = data_loader.load_nsl_kdd()
+    except FileNotFoundError:
+        logger.error("NSL-KDD dataset not found for preprocessor fitting.")
+        return None
+
+    preprocessor = DataPreprocessor(scaling_method=scaling_method)
+    X_train, _, _ = preprocessor.fit_transform(train_data, label_column='label')
+    logger.info(f"Preprocessor fitted on training data shape: {X_train.shape}")
+
+    # Cache for subsequent runs; atomic rename so readers never see a partial file
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        joblib.dump(preprocessor, tmp_path)
+        os.replace(tmp_path, cache_path)
+        logger.info(f"Cached fitted preprocessor at {cache_path}")
+    except Exception as e:
+        logger.warning(f"Could not cache preprocessor: {e}")
+
+    return preprocessor
+
+
 def run_detection(config, args):
     """
     Run real-time detection.
-    
+
     Args:
         config: Configuration dictionary
         args: Command line arguments
@@ -157,26 +218,18 @@ def run_detection(config, args):
         return
 
     try:
-        model = joblib.load(model_path)
+        # mmap so concurrent detector processes share the forest's pages
+        model = joblib.load(model_path, mmap_mode='r')
         logger.info("Loaded trained random_forest model")
     except Exception as e:
         logger.error(f"Failed to load model: {e}")
         return
 
-    # Fit preprocessor on training data for feature alignment
-    data_loader = DataLoader(config.get('data', {}).get('raw_data_path', 'data/raw'))
-    try:
-        train_data, _ = data_loader.load_nsl_kdd()
-    except FileNotFoundError:
-        logger.error("NSL-KDD dataset not found for preprocessor fitting.")
+    # Fitted preprocessor for feature alignment (cached across runs)
+    preprocessor = _load_fitted_preprocessor(config, logger)
+    if preprocessor is None:
         return
 
-    preprocessor = DataPreprocessor(
-        scaling_method=config.get('features', {}).get('scaling_method', 'standard')
-    )
-    X_train, y_train, _ = preprocessor.fit_transform(train_data, label_column='label')
-    logger.info(f"Preprocessor fitted on training data shape: {X_train.shape}")
-
     # Check if multiple interfaces specified
     interfaces = getattr(args, 'interfaces', None)
     interface = args.interface
@@ -212,7 +265,14 @@ def run_detection(config, args):
             monitor.stop_monitoring()
         return
     
-    # Single-interface mode
+    # Single-interface mode: compile the forest to ONNX when the tooling is
+    # installed so per-packet predictions run in native code off the GIL
+    n_features = getattr(model, 'n_features_in_', None)
+    if n_features:
+        compiled = compile_forest(model, int(n_features))
+        if compiled is not None:
+            model = compiled
+
     detector = RealtimeDetector(config, model, preprocessor)
 
     if packet_count is not None:
@@ -291,26 +351,17 @@ def run_pcap_analysis(config, args):
         return
     
     try:
-        model = joblib.load(model_path)
+        model = joblib.load(model_path, mmap_mode='r')
         logger.info(f"Loaded trained {args.model} model")
     except Exception as e:
         logger.error(f"Failed to load model: {e}")
         return
-    
-    # Fit preprocessor on training data
-    data_loader = DataLoader(config.get('data', {}).get('raw_data_path', 'data/raw'))
-    try:
-        train_data, _ = data_loader.load_nsl_kdd()
-    except FileNotFoundError:
-        logger.error("NSL-KDD dataset not found for preprocessor fitting.")
+
+    # Fitted preprocessor for feature alignment (cached across runs)
+    preprocessor = _load_fitted_preprocessor(config, logger)
+    if preprocessor is None:
         return
     
-    preprocessor = DataPreprocessor(
-        scaling_method=config.get('features', {}).get('scaling_method', 'standard')
-    )
-    X_train, y_train, _ = preprocessor.fit_transform(train_data, label_column='label')
-    logger.info(f"Preprocessor fitted on training data shape: {X_train.shape}")
-    
     # Create analyzer
     analyzer = PcapAnalyzer(
         config=config,
@@ -0,0 +1,103 @@
+"""
+Shared read-only memmap cache for large training arrays.
+
+joblib-parallel estimators (RandomForest, IsolationForest, LOF with
+n_jobs=-1) memmap any array over 1MB into a temp file on every fit so
+loky workers can share it, then discard the file. Converting the array
+to a persistent numpy.memmap once lets every worker open the same file
+zero-copy and skips the repeated serialization and tmpdir churn.
+"""
+
+import atexit
+import os
+import tempfile
+import weakref
+from typing import Dict, Tuple
+
+import numpy as np
+
+# Below this size the serialization being avoided is cheaper than a
+# temp-file round trip (matches joblib's own max_nbytes default)
+_MEMMAP_THRESHOLD = 1 << 20
+
+_Key = Tuple[int, Tuple[int, ...], str]
+
+_cache: Dict[_Key, np.memmap] = {}
+_sources: Dict[_Key, "weakref.ref"] = {}
+_files: Dict[_Key, str] = {}
+
+
+def as_memmap(X: np.ndarray) -> np.ndarray:
+    """
+    Return a read-only memmap view of X, spilling it to a temp file once.
+
+    Arrays under 1MB, non-ndarray inputs, and arrays that are already
+    memmaps pass through untouched. Repeat calls with the same array
+    reuse the cached memmap. The data pointer alone is not a stable
+    identity — the allocator reuses freed addresses — so each entry
+    holds a weakref to its source array: a hit must be the same object,
+    and entries are evicted when their source is collected.
+
+    Args:
+        X: Feature array
+
+    Returns:
+        numpy.memmap over X's data, or X itself when mapping isn't worthwhile
+    """
+    if not isinstance(X, np.ndarray) or isinstance(X, np.memmap):
+        return X
+    if X.nbytes <= _MEMMAP_THRESHOLD:
+        return X
+    key = (X.__array_interface__['data'][0], X.shape, X.dtype.str)
+    cached = _cache.get(key)
+    if cached is not None:
+        if _sources[key]() is X:
+            return cached
+        # Address reused by a different array before the old source's
+        # finalizer ran — drop the stale spill and fall through
+        _evict(key)
+    fd, path = tempfile.mkstemp(prefix='anomaly_memmap_', suffix='.npy')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, X)
+        mapped = np.load(path, mmap_mode='r')
+    except Exception:
+        os.unlink(path)
+        return X
+    _cache[key] = mapped
+    _sources[key] = weakref.ref(X)
+    _files[key] = path
+    weakref.finalize(X, _evict, key)
+    return mapped
+
+
+def _evict(key: _Key):
+    """Drop one cache entry and its temp file once its source is gone."""
+    ref = _sources.get(key)
+    if ref is not None and ref() is not None:
+        # The slot was re-keyed to a live array; its own finalizer will
+        # evict it later
+        return
+    _sources.pop(key, None)
+    _cache.pop(key, None)
+    path = _files.pop(key, None)
+    if path is not None:
+        # Unlinking is safe while workers still hold the mapping; the
+        # inode lives until the last mapping is closed
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+@atexit.register
+def _cleanup():
+    """Drop cached memmaps and delete their backing temp files."""
+    _cache.clear()
+    _sources.clear()
+    while _files:
+        _, path = _files.popitem()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
@@ -7,10 +7,66 @@ import tensorflow as tf
 from tensorflow import keras
 from tensorflow.keras import layers, models
 from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 import os
 
 
+class _TFLiteRunner:
+    """Thin wrapper around a tf.lite.Interpreter for batched inference."""
+
+    def __init__(self, model_path: str):
+        self.interpreter = tf.lite.Interpreter(model_path=model_path)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        if tuple(self._input['shape']) != X.shape:
+            self.interpreter.resize_tensor_input(self._input['index'], X.shape)
+            self.interpreter.allocate_tensors()
+            self._input = self.interpreter.get_input_details()[0]
+            self._output = self.interpreter.get_output_details()[0]
+        self.interpreter.set_tensor(self._input['index'], X)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self._output['index'])
+
+
+def _export_tflite(model, export_path: str, quantize: str = 'float16',
+                   representative_data: Optional[np.ndarray] = None) -> str:
+    """Convert a Keras model to a quantized TFLite flatbuffer and write it.
+
+    Args:
+        model: Trained Keras model
+        export_path: Destination .tflite path
+        quantize: 'float16' or 'int8' (int8 needs representative_data)
+        representative_data: Sample inputs for int8 calibration
+
+    Returns:
+        The export path
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantize == 'float16':
+        converter.target_spec.supported_types = [tf.float16]
+    elif quantize == 'int8':
+        if representative_data is None:
+            raise ValueError("int8 quantization requires representative_data")
+
+        def _representative_gen():
+            for i in range(0, min(len(representative_data), 512), 32):
+                yield [representative_data[i:i + 32].astype(np.float32)]
+
+        converter.representative_dataset = _representative_gen
+    content = converter.convert()
+    export_dir = os.path.dirname(export_path)
+    if export_dir:
+        os.makedirs(export_dir, exist_ok=True)
+    with open(export_path, 'wb') as f:
+        f.write(content)
+    return export_path
+
+
 class AutoEncoder:
     """Autoencoder for unsupervised anomaly detection."""
     
@@ -28,7 +84,9 @@ class AutoEncoder:
         self.encoder = None
         self.decoder = None
         self.history = None
+        self._tflite = None
         self._build_model()
+        self._compile_inference()
     
     def _build_model(self):
         """Build autoencoder model."""
@@ -66,6 +124,14 @@ class AutoEncoder:
             loss='mse',
             metrics=['mae']
         )
+
+    def _compile_inference(self):
+        """Compile the forward pass with tf.function + XLA for low-latency predict."""
+        self._infer = tf.function(
+            self.model,
+            jit_compile=True,
+            input_signature=[tf.TensorSpec((None, self.input_dim), tf.float32)]
+        )
     
     def train(self, X_train: np.ndarray, X_val: np.ndarray, save_path: str = None):
         """
@@ -110,8 +176,13 @@ class AutoEncoder:
         Returns:
             Reconstruction errors
         """
-        reconstructions = self.model.predict(X, verbose=0)
-        mse = np.mean(np.power(X - reconstructions, 2), axis=1)
+        if self._tflite is not None:
+            reconstructions = self._tflite(X)
+        else:
+            reconstructions = self._infer(tf.convert_to_tensor(X, dtype=tf.float32)).numpy()
+        diff = np.asarray(X, dtype=reconstructions.dtype) - reconstructions
+        # einsum fuses square+sum into one pass, avoiding the squared temporary
+        mse = np.einsum('ij,ij->i', diff, diff) / diff.shape[1]
         return mse
     
     def predict(self, X: np.ndarray, threshold: float = None) -> np.ndarray:
@@ -140,6 +211,16 @@ class AutoEncoder:
     def load(self, load_path: str):
         """Load model."""
         self.model = keras.models.load_model(load_path)
+        self._compile_inference()
+
+    def export_tflite(self, export_path: str, quantize: str = 'float16',
+                      representative_data: np.ndarray = None) -> str:
+        """Export a quantized TFLite model for edge inference."""
+        return _export_tflite(self.model, export_path, quantize, representative_data)
+
+    def load_tflite(self, model_path: str):
+        """Load a quantized TFLite model; subsequent inference uses it."""
+        self._tflite = _TFLiteRunner(model_path)
 
 
 class LSTMDetector:
@@ -157,7 +238,9 @@ class LSTMDetector:
         self.config = config
         self.model = None
         self.history = None
+        self._tflite = None
         self._build_model()
+        self._compile_inference()
     
     def _build_model(self):
         """Build LSTM model."""
@@ -181,6 +264,14 @@ class LSTMDetector:
         )
         
         self.model = model
+
+    def _compile_inference(self):
+        """Compile the forward pass with tf.function + XLA for low-latency predict."""
+        self._infer = tf.function(
+            self.model,
+            jit_compile=True,
+            input_signature=[tf.TensorSpec((None,) + self.input_shape, tf.float32)]
+        )
     
     def train(self, X_train: np.ndarray, y_train: np.ndarray,
               X_val: np.ndarray, y_val: np.ndarray, save_path: str = None):
@@ -220,13 +311,15 @@ class LSTMDetector:
     
     def predict(self, X: np.ndarray, threshold: float = 0.5) -> np.ndarray:
         """Make predictions."""
-        probabilities = self.model.predict(X, verbose=0)
+        probabilities = self.predict_proba(X)
         predictions = (probabilities > threshold).astype(int).flatten()
         return predictions
     
     def predict_proba(self, X: np.ndarray) -> np.ndarray:
         """Get prediction probabilities."""
-        return self.model.predict(X, verbose=0)
+        if self._tflite is not None:
+            return self._tflite(X)
+        return self._infer(tf.convert_to_tensor(X, dtype=tf.float32)).numpy()
     
     def save(self, save_path: str):
         """Save model."""
@@ -235,6 +328,16 @@ class LSTMDetector:
     def load(self, load_path: str):
         """Load model."""
         self.model = keras.models.load_model(load_path)
+        self._compile_inference()
+
+    def export_tflite(self, export_path: str, quantize: str = 'float16',
+                      representative_data: np.ndarray = None) -> str:
+        """Export a quantized TFLite model for edge inference."""
+        return _export_tflite(self.model, export_path, quantize, representative_data)
+
+    def load_tflite(self, model_path: str):
+        """Load a quantized TFLite model; subsequent inference uses it."""
+        self._tflite = _TFLiteRunner(model_path)
 
 
 class DNNClassifier:
@@ -252,8 +355,11 @@ class DNNClassifier:
         self.config = config
         self.model = None
         self.history = None
+        self._tflite = None
+        self._inference_model = None
         self._build_model()
-    
+        self._compile_inference()
+
     def _build_model(self):
         """Build DNN model."""
         hidden_layers = self.config.get('hidden_layers', [128, 64, 32])
@@ -277,7 +383,55 @@ class DNNClassifier:
         )
         
         self.model = model
-    
+
+    def _compile_inference(self):
+        """Compile the forward pass with tf.function + XLA for low-latency predict."""
+        self._infer = tf.function(
+            self._inference_model or self.model,
+            jit_compile=True,
+            input_signature=[tf.TensorSpec((None, self.input_dim), tf.float32)]
+        )
+
+    def finalize_for_inference(self):
+        """Build a slimmed inference model after training.
+
+        Dropout layers are dropped (identity at inference) and each
+        BatchNormalization is folded into the Dense layer that follows it:
+        with BN(h) = scale*h + shift, the next Dense computes
+        h @ (scale[:, None] * W) + (shift @ W + b) exactly. For the
+        Dense->Dropout->BatchNorm stacks built here this halves the op count
+        per predict call.
+        """
+        scale = shift = None
+        folded = []  # (units, activation, W, b)
+        for layer in self.model.layers:
+            if isinstance(layer, layers.Dropout):
+                continue
+            if isinstance(layer, layers.BatchNormalization):
+                gamma, beta, mean, var = layer.get_weights()
+                scale = gamma / np.sqrt(var + layer.epsilon)
+                shift = beta - mean * scale
+                continue
+            if isinstance(layer, layers.Dense):
+                W, b = layer.get_weights()
+                if scale is not None:
+                    b = b + shift.dot(W)
+                    W = W * scale[:, None]
+                    scale = shift = None
+                folded.append((layer.units, layer.activation, W, b))
+
+        inference = models.Sequential()
+        inference.add(layers.Input(shape=(self.input_dim,)))
+        for units, activation, W, b in folded:
+            inference.add(layers.Dense(units, activation=activation))
+        inference.build((None, self.input_dim))
+        for dense, (_, _, W, b) in zip(inference.layers, folded):
+            dense.set_weights([W, b])
+
+        self._inference_model = inference
+        self._compile_inference()
+        return inference
+
     def train(self, X_train: np.ndarray, y_train: np.ndarray,
               X_val: np.ndarray, y_val: np.ndarray, save_path: str = None):
         """
@@ -313,16 +467,22 @@ class DNNClassifier:
         )
         
         print("DNN training complete!")
+
+        # Any previously folded inference model is stale after (re)training
+        self._inference_model = None
+        self._compile_inference()
     
     def predict(self, X: np.ndarray, threshold: float = 0.5) -> np.ndarray:
         """Make predictions."""
-        probabilities = self.model.predict(X, verbose=0)
+        probabilities = self.predict_proba(X)
         predictions = (probabilities > threshold).astype(int).flatten()
         return predictions
     
     def predict_proba(self, X: np.ndarray) -> np.ndarray:
         """Get prediction probabilities."""
-        return self.model.predict(X, verbose=0)
+        if self._tflite is not None:
+            return self._tflite(X)
+        return self._infer(tf.convert_to_tensor(X, dtype=tf.float32)).numpy()
     
     def save(self, save_path: str):
         """Save model."""
@@ -330,4 +490,15 @@ class DNNClassifier:
     
     def load(self, load_path: str):
         """Load model."""
-        self.model = keras.models.load_model(load_path)
\ No newline at end of file
+        self.model = keras.models.load_model(load_path)
+        self._inference_model = None
+        self._compile_inference()
+
+    def export_tflite(self, export_path: str, quantize: str = 'float16',
+                      representative_data: np.ndarray = None) -> str:
+        """Export a quantized TFLite model for edge inference."""
+        return _export_tflite(self._inference_model or self.model, export_path, quantize, representative_data)
+
+    def load_tflite(self, model_path: str):
+        """Load a quantized TFLite model; subsequent inference uses it."""
+        self._tflite = _TFLiteRunner(model_path)
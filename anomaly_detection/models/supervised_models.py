@@ -2,15 +2,27 @@
 Supervised machine learning models for anomaly detection.
 """
 
+import os
+
+# Optional Intel oneDAL acceleration: patch_sklearn must run before any
+# sklearn import so SVC/RandomForest/LogisticRegression dispatch to the
+# vectorized, multithreaded kernels. Opt out with ANOMALY_DISABLE_INTELEX=1.
+if not os.environ.get('ANOMALY_DISABLE_INTELEX'):
+    try:
+        from sklearnex import patch_sklearn
+        patch_sklearn(verbose=False)
+    except ImportError:
+        pass
+
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
 from sklearn.svm import SVC
 from sklearn.linear_model import LogisticRegression
 from sklearn.tree import DecisionTreeClassifier
 from typing import Dict, Any, Optional
 import joblib
-import os
 
+from .memmap_cache import as_memmap
 
 class SupervisedModels:
     """Collection of supervised learning models."""
@@ -37,22 +49,29 @@ class SupervisedModels:
             n_jobs=-1
         )
         
-        # Gradient Boosting
+        # Gradient Boosting: histogram-based variant trains with integer-
+        # binned features and OpenMP-parallel split finding, orders of
+        # magnitude faster than the classic sample-level implementation
         gb_config = self.config.get('gradient_boosting', {})
-        self.models['gradient_boosting'] = GradientBoostingClassifier(
-            n_estimators=gb_config.get('n_estimators', 100),
+        self.models['gradient_boosting'] = HistGradientBoostingClassifier(
+            max_iter=gb_config.get('n_estimators', 100),
             learning_rate=gb_config.get('learning_rate', 0.1),
             max_depth=gb_config.get('max_depth', 5),
+            max_bins=gb_config.get('max_bins', 255),
+            early_stopping=gb_config.get('early_stopping', True),
             random_state=gb_config.get('random_state', 42)
         )
         
-        # Support Vector Machine
+        # Support Vector Machine. probability=True would run a 5-fold
+        # Platt-scaling CV inside every fit (~5x training time);
+        # predict_proba falls back to a sigmoid over the margin instead.
+        # The larger kernel cache keeps RBF rows resident during training.
         svm_config = self.config.get('svm', {})
         self.models['svm'] = SVC(
             kernel=svm_config.get('kernel', 'rbf'),
             C=svm_config.get('C', 1.0),
             gamma=svm_config.get('gamma', 'scale'),
-            probability=True,
+            cache_size=svm_config.get('cache_size', 500),
             random_state=svm_config.get('random_state', 42)
         )
         
@@ -69,6 +88,25 @@ class SupervisedModels:
             random_state=42
         )
     
+    @staticmethod
+    def _prep(X: np.ndarray) -> np.ndarray:
+        """
+        Cast features to contiguous float32 for inference.
+
+        Tree traversal is memory-bound and sklearn's tree code works in
+        float32 internally, so handing it float32 input halves the
+        bandwidth and skips sklearn's own validation copy. Upstream
+        feature extraction should emit float32 directly to avoid even
+        this cast.
+
+        Args:
+            X: Feature array
+
+        Returns:
+            C-contiguous float32 view or copy of X
+        """
+        return np.ascontiguousarray(X, dtype=np.float32)
+
     def train(self, model_name: str, X_train: np.ndarray, y_train: np.ndarray):
         """
         Train a specific model.
@@ -82,7 +120,9 @@ class SupervisedModels:
             raise ValueError(f"Unknown model: {model_name}")
         
         print(f"Training {model_name}...")
-        self.models[model_name].fit(X_train, y_train)
+        # Persistent memmap: joblib workers open the same file zero-copy
+        # instead of re-serializing the array on every parallel fit
+        self.models[model_name].fit(as_memmap(X_train), y_train)
         print(f"{model_name} training complete!")
     
     def predict(self, model_name: str, X: np.ndarray) -> np.ndarray:
@@ -98,8 +138,8 @@ class SupervisedModels:
         """
         if model_name not in self.models:
             raise ValueError(f"Unknown model: {model_name}")
-        
-        return self.models[model_name].predict(X)
+
+        return self.models[model_name].predict(self._prep(X))
     
     def predict_proba(self, model_name: str, X: np.ndarray) -> np.ndarray:
         """
@@ -114,8 +154,17 @@ class SupervisedModels:
         """
         if model_name not in self.models:
             raise ValueError(f"Unknown model: {model_name}")
-        
-        return self.models[model_name].predict_proba(X)
+
+        model = self.models[model_name]
+        X = self._prep(X)
+        try:
+            return model.predict_proba(X)
+        except AttributeError:
+            # SVC without Platt scaling: a sigmoid over the signed margin is
+            # a cheap monotone surrogate for the class-1 probability
+            scores = model.decision_function(X)
+            p1 = 1.0 / (1.0 + np.exp(-scores))
+            return np.column_stack([1.0 - p1, p1])
     
     def get_model(self, model_name: str):
         """
@@ -141,7 +190,11 @@ class SupervisedModels:
             raise ValueError(f"Unknown model: {model_name}")
         
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        joblib.dump(self.models[model_name], save_path)
+        # protocol=5 pickles numpy buffers out-of-band (zero-copy).
+        # Saved uncompressed on purpose: joblib can only mmap plain
+        # files, and the demand-paged sharing on load is worth more
+        # than the disk space compression would save
+        joblib.dump(self.models[model_name], save_path, protocol=5)
         print(f"Model saved: {save_path}")
     
     def load_model(self, model_name: str, load_path: str):
@@ -155,7 +208,9 @@ class SupervisedModels:
         if not os.path.exists(load_path):
             raise FileNotFoundError(f"Model file not found: {load_path}")
         
-        self.models[model_name] = joblib.load(load_path)
+        # mmap read-only so the model's arrays are demand-paged and shared
+        # across processes instead of copied into each heap
+        self.models[model_name] = joblib.load(load_path, mmap_mode='r')
         print(f"Model loaded: {load_path}")
     
     def get_feature_importance(self, model_name: str) -> Optional[np.ndarray]:
@@ -2,13 +2,53 @@
 Unsupervised machine learning models for anomaly detection.
 """
 
+import os
+
+# Optional Intel oneDAL acceleration: patch_sklearn must run before any
+# sklearn import so KMeans/DBSCAN dispatch to the vectorized,
+# multithreaded kernels. Opt out with ANOMALY_DISABLE_INTELEX=1.
+if not os.environ.get('ANOMALY_DISABLE_INTELEX'):
+    try:
+        from sklearnex import patch_sklearn
+        patch_sklearn(verbose=False)
+    except ImportError:
+        pass
+
 import numpy as np
 from sklearn.ensemble import IsolationForest
-from sklearn.cluster import KMeans, DBSCAN
-from sklearn.neighbors import LocalOutlierFactor
+from sklearn.cluster import KMeans, MiniBatchKMeans, DBSCAN
+from sklearn.metrics import pairwise_distances_argmin_min
+from sklearn.neighbors import LocalOutlierFactor, NearestNeighbors
 from typing import Dict, Any
 import joblib
-import os
+
+from .memmap_cache import as_memmap
+
+from joblib import Parallel, delayed, effective_n_jobs
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except Exception:
+    _NUMBA_AVAILABLE = False
+
+if _NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _kmeans_min_sqdist(X, centers, out):
+        # Fused nearest-centroid squared distance: no N x K temporary and
+        # no separate predict pass; parallel over samples
+        n, d = X.shape
+        n_centers = centers.shape[0]
+        for i in prange(n):
+            best = 1e38
+            for k in range(n_centers):
+                s = 0.0
+                for j in range(d):
+                    diff = X[i, j] - centers[k, j]
+                    s += diff * diff
+                if s < best:
+                    best = s
+            out[i] = best
 
 
 class UnsupervisedModels:
@@ -23,6 +63,11 @@ class UnsupervisedModels:
         """
         self.config = config
         self.models = {}
+        # DBSCAN fit artifacts, cached so score queries never rerun the
+        # O(N^2) clustering (DBSCAN has no out-of-sample predict)
+        self._dbscan_train_X = None
+        self._dbscan_labels = None
+        self._dbscan_neighbors = None
         self._initialize_models()
     
     def _initialize_models(self):
@@ -36,13 +81,27 @@ class UnsupervisedModels:
             n_jobs=-1
         )
         
-        # K-Means
+        # K-Means: mini-batch by default — streaming centroid updates match
+        # full-batch accuracy at a fraction of the compute on large training
+        # sets. Set kmeans.use_minibatch: false for small (<5K sample)
+        # datasets where exact Lloyd iterations are cheap anyway.
         kmeans_config = self.config.get('kmeans', {})
-        self.models['kmeans'] = KMeans(
-            n_clusters=kmeans_config.get('n_clusters', 5),
-            random_state=kmeans_config.get('random_state', 42),
-            n_init=10
-        )
+        n_clusters = kmeans_config.get('n_clusters', 5)
+        if kmeans_config.get('use_minibatch', True):
+            self.models['kmeans'] = MiniBatchKMeans(
+                n_clusters=n_clusters,
+                batch_size=kmeans_config.get('batch_size', max(1024, 3 * n_clusters)),
+                n_init=3,
+                max_iter=100,
+                reassignment_ratio=0.01,
+                random_state=kmeans_config.get('random_state', 42)
+            )
+        else:
+            self.models['kmeans'] = KMeans(
+                n_clusters=n_clusters,
+                random_state=kmeans_config.get('random_state', 42),
+                n_init=10
+            )
         
         # DBSCAN
         dbscan_config = self.config.get('dbscan', {})
@@ -60,6 +119,49 @@ class UnsupervisedModels:
             n_jobs=-1
         )
     
+    @staticmethod
+    def _parallel_score(score_method, X: np.ndarray, n_jobs: int = -1) -> np.ndarray:
+        """
+        Apply a per-sample scoring method over chunks of X in parallel.
+
+        IsolationForest and LOF score sequentially per call, so large
+        batches are split across cores; small batches aren't worth the
+        worker dispatch overhead and run inline.
+
+        Args:
+            score_method: Bound estimator method (predict/decision_function/...)
+            X: Feature array
+            n_jobs: Number of parallel jobs (-1 for all cores)
+
+        Returns:
+            Concatenated scores in input order
+        """
+        n_chunks = min(effective_n_jobs(n_jobs), max(1, len(X)))
+        if n_chunks <= 1 or len(X) < 1024:
+            return score_method(X)
+        parts = Parallel(n_jobs=n_chunks, backend='loky', max_nbytes='1G')(
+            delayed(score_method)(chunk) for chunk in np.array_split(X, n_chunks)
+        )
+        return np.concatenate(parts)
+
+    @staticmethod
+    def _prep(X: np.ndarray) -> np.ndarray:
+        """
+        Cast features to contiguous float32 for inference.
+
+        IsolationForest traversal and neighbor queries are memory-bound;
+        float32 input halves the bandwidth and skips sklearn's internal
+        validation copy. Upstream feature extraction should emit float32
+        directly to avoid even this cast.
+
+        Args:
+            X: Feature array
+
+        Returns:
+            C-contiguous float32 view or copy of X
+        """
+        return np.ascontiguousarray(X, dtype=np.float32)
+
     def train(self, model_name: str, X_train: np.ndarray):
         """
         Train a specific unsupervised model.
@@ -72,7 +174,21 @@ class UnsupervisedModels:
             raise ValueError(f"Unknown model: {model_name}")
         
         print(f"Training {model_name}...")
-        self.models[model_name].fit(X_train)
+        # Persistent memmap: joblib workers open the same file zero-copy
+        # instead of re-serializing the array on every parallel fit
+        self.models[model_name].fit(as_memmap(X_train))
+        if model_name == 'dbscan':
+            model = self.models['dbscan']
+            self._dbscan_train_X = X_train
+            self._dbscan_labels = model.labels_
+            # Radius index over the core samples classifies new points as
+            # member vs noise without reclustering
+            if len(getattr(model, 'components_', [])) > 0:
+                self._dbscan_neighbors = NearestNeighbors(
+                    radius=model.eps, n_jobs=-1
+                ).fit(model.components_)
+            else:
+                self._dbscan_neighbors = None
         print(f"{model_name} training complete!")
     
     def predict(self, model_name: str, X: np.ndarray) -> np.ndarray:
@@ -89,24 +205,84 @@ class UnsupervisedModels:
         if model_name not in self.models:
             raise ValueError(f"Unknown model: {model_name}")
         
-        predictions = self.models[model_name].predict(X)
-        
-        # Convert to binary: 1 for normal, 0 for anomaly
+        # Convert to binary: 1 for normal, 0 for anomaly.
+        # DBSCAN keeps the caller's array so the cached train-matrix
+        # identity check in _dbscan_noise_labels still fires.
+        if model_name == 'dbscan':
+            # DBSCAN has no predict; -1 means noise (anomaly), others are clusters
+            return np.where(self._dbscan_noise_labels(X) == -1, 1, 0)
+
+        X = self._prep(X)
         if model_name in ['isolation_forest', 'lof']:
             # Isolation Forest and LOF return 1 for inliers, -1 for outliers
+            predictions = self._parallel_score(self.models[model_name].predict, X)
             predictions = np.where(predictions == 1, 0, 1)
         elif model_name == 'kmeans':
-            # For K-Means, we need to define anomalies based on distance to centroid
-            distances = self.models[model_name].transform(X)
-            min_distances = np.min(distances, axis=1)
-            threshold = np.percentile(min_distances, 90)
+            # For K-Means, anomalies are points far from their nearest
+            # centroid; squared distance preserves the percentile cut
+            min_distances = self._kmeans_sqdist(X)
+            threshold = np.quantile(min_distances, 0.9, method='lower')
             predictions = np.where(min_distances > threshold, 1, 0)
-        elif model_name == 'dbscan':
-            # DBSCAN: -1 means noise (anomaly), others are clusters
-            predictions = np.where(predictions == -1, 1, 0)
-        
+        else:
+            predictions = self.models[model_name].predict(X)
+
         return predictions
     
+    def _kmeans_sqdist(self, X: np.ndarray) -> np.ndarray:
+        """
+        Squared distance from each sample to its nearest KMeans centroid.
+
+        With numba installed this runs a fused, sample-parallel kernel
+        that avoids the N x K distance matrix entirely; otherwise
+        pairwise_distances_argmin_min reduces cache-sized blocks in one
+        BLAS pass, never materializing the N x K matrix either.
+
+        Args:
+            X: Feature array
+
+        Returns:
+            Array of per-sample squared distances
+        """
+        centers = self.models['kmeans'].cluster_centers_
+        if _NUMBA_AVAILABLE:
+            out = np.empty(len(X), dtype=np.float64)
+            _kmeans_min_sqdist(
+                np.ascontiguousarray(X, dtype=np.float64),
+                np.ascontiguousarray(centers, dtype=np.float64),
+                out
+            )
+            return out
+        _, min_sqdist = pairwise_distances_argmin_min(
+            X, centers, metric='euclidean', metric_kwargs={'squared': True}
+        )
+        return min_sqdist
+
+    def _dbscan_noise_labels(self, X: np.ndarray) -> np.ndarray:
+        """
+        Cluster/noise labels for X without refitting DBSCAN.
+
+        The training matrix reuses the labels from fit; other points are
+        labelled by a radius query against the fitted core samples (member
+        if within eps of any core point, noise otherwise). Falls back to
+        fit_predict only when the model was never trained through train().
+
+        Args:
+            X: Feature array
+
+        Returns:
+            Label array with -1 marking noise points
+        """
+        if X is self._dbscan_train_X and self._dbscan_labels is not None:
+            return self._dbscan_labels
+        if self._dbscan_neighbors is not None:
+            neighbors = self._dbscan_neighbors.radius_neighbors(X, return_distance=False)
+            return np.fromiter(
+                (0 if len(n) else -1 for n in neighbors),
+                dtype=np.int64,
+                count=len(X)
+            )
+        return self.models['dbscan'].fit_predict(X)
+
     def get_anomaly_scores(self, model_name: str, X: np.ndarray) -> np.ndarray:
         """
         Get anomaly scores for samples.
@@ -121,28 +297,31 @@ class UnsupervisedModels:
         if model_name not in self.models:
             raise ValueError(f"Unknown model: {model_name}")
         
-        if model_name == 'isolation_forest':
+        if model_name == 'dbscan':
+            # DBSCAN doesn't have a built-in scoring method; use a simple
+            # membership heuristic on the caller's array (see predict)
+            scores = np.where(self._dbscan_noise_labels(X) == -1, 1.0, 0.0)
+        elif model_name == 'isolation_forest':
             # Decision function returns anomaly scores
-            scores = -self.models[model_name].decision_function(X)
+            scores = -self._parallel_score(self.models[model_name].decision_function, self._prep(X))
         elif model_name == 'lof':
             # LOF score
-            scores = -self.models[model_name].score_samples(X)
+            scores = -self._parallel_score(self.models[model_name].score_samples, self._prep(X))
         elif model_name == 'kmeans':
-            # Distance to nearest centroid
-            distances = self.models[model_name].transform(X)
-            scores = np.min(distances, axis=1)
-        elif model_name == 'dbscan':
-            # DBSCAN doesn't have a built-in scoring method
-            # Use a simple heuristic based on cluster membership
-            predictions = self.models[model_name].fit_predict(X)
-            scores = np.where(predictions == -1, 1.0, 0.0)
+            # Distance to the nearest centroid
+            scores = np.sqrt(self._kmeans_sqdist(self._prep(X)))
         else:
             scores = np.zeros(len(X))
         
-        # Normalize scores to [0, 1]
-        if len(scores) > 0 and scores.max() != scores.min():
-            scores = (scores - scores.min()) / (scores.max() - scores.min())
-        
+        # Normalize scores to [0, 1] in place: min/max computed once and
+        # no temporary arrays, so the tail costs two linear passes
+        if len(scores) > 0:
+            lo = scores.min()
+            span = scores.max() - lo
+            if span > 0:
+                np.subtract(scores, lo, out=scores)
+                np.multiply(scores, 1.0 / span, out=scores)
+
         return scores
     
     def get_model(self, model_name: str):
@@ -169,7 +348,11 @@ class UnsupervisedModels:
             raise ValueError(f"Unknown model: {model_name}")
         
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        joblib.dump(self.models[model_name], save_path)
+        # protocol=5 pickles numpy buffers out-of-band (zero-copy).
+        # Saved uncompressed on purpose: joblib can only mmap plain
+        # files, and the demand-paged sharing on load is worth more
+        # than the disk space compression would save
+        joblib.dump(self.models[model_name], save_path, protocol=5)
         print(f"Model saved: {save_path}")
     
     def load_model(self, model_name: str, load_path: str):
@@ -183,5 +366,7 @@ class UnsupervisedModels:
         if not os.path.exists(load_path):
             raise FileNotFoundError(f"Model file not found: {load_path}")
         
-        self.models[model_name] = joblib.load(load_path)
+        # mmap read-only so the model's arrays are demand-paged and shared
+        # across processes instead of copied into each heap
+        self.models[model_name] = joblib.load(load_path, mmap_mode='r')
         print(f"Model loaded: {load_path}")
\ No newline at end of file
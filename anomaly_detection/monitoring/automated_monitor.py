@@ -7,8 +7,15 @@ from typing import Dict, Any
 from datetime import datetime
 import psutil
 import numpy as np
+import pandas as pd
 from ..utils.logger import LoggerFactory
 
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except Exception:
+    _ORJSON_AVAILABLE = False
+
 
 class AutomatedMonitor:
     """Automated monitoring system for model and system performance."""
@@ -29,10 +36,32 @@ class AutomatedMonitor:
         self.metrics_interval = mon_config.get('metrics_interval', 300)
         self.performance_tracking = mon_config.get('performance_tracking', True)
         
-        # Metrics storage
-        self.system_metrics = []
+        # System metrics live in preallocated per-column ring buffers so
+        # long runs use constant memory and summaries are single vectorized
+        # reductions instead of per-dict Python loops
+        capacity = mon_config.get('metrics_capacity', 4096)
+        self._capacity = capacity
+        self._ts = np.empty(capacity, dtype='datetime64[s]')
+        self._cpu = np.empty(capacity, dtype=np.float32)
+        self._mem = np.empty(capacity, dtype=np.float32)
+        self._disk = np.empty(capacity, dtype=np.float32)
+        self._gpu_util = np.full(capacity, np.nan, dtype=np.float32)
+        self._gpu_mem = np.full(capacity, np.nan, dtype=np.float32)
+        self._n = 0
+
         self.model_metrics = []
         self.running = False
+
+        # Prime the CPU counter so the first non-blocking cpu_percent
+        # call returns a real delta instead of 0.0
+        psutil.cpu_percent(interval=None)
+
+    def _metric_column(self, arr: np.ndarray) -> np.ndarray:
+        """Valid samples of a metric column, oldest first."""
+        if self._n <= self._capacity:
+            return arr[:self._n]
+        split = self._n % self._capacity
+        return np.concatenate([arr[split:], arr[:split]])
     
     def start_monitoring(self):
         """Start automated monitoring."""
@@ -44,13 +73,14 @@ class AutomatedMonitor:
         self.logger.info("Automated monitoring started")
         
         try:
+            # Deadline scheduler: each tick is scheduled from the previous
+            # deadline, so collection time doesn't drift the cadence
+            next_tick = time.monotonic()
             while self.running:
-                # Collect metrics
                 self._collect_system_metrics()
-                
-                # Sleep for interval
-                time.sleep(self.metrics_interval)
-                
+                next_tick += self.metrics_interval
+                time.sleep(max(0.0, next_tick - time.monotonic()))
+
         except KeyboardInterrupt:
             self.logger.info("Monitoring interrupted by user")
         finally:
@@ -65,31 +95,36 @@ class AutomatedMonitor:
     def _collect_system_metrics(self):
         """Collect system performance metrics."""
         try:
-            metrics = {
-                'timestamp': datetime.now(),
-                'cpu_percent': psutil.cpu_percent(interval=1),
-                'memory_percent': psutil.virtual_memory().percent,
-                'disk_usage': psutil.disk_usage('/').percent
-            }
-            
+            # Non-blocking: utilization since the previous call, instead of
+            # parking the thread for a full second every sample
+            cpu = psutil.cpu_percent(interval=None)
+            mem = psutil.virtual_memory().percent
+            disk = psutil.disk_usage('/').percent
+
+            slot = self._n % self._capacity
+            self._ts[slot] = np.datetime64(datetime.now(), 's')
+            self._cpu[slot] = cpu
+            self._mem[slot] = mem
+            self._disk[slot] = disk
+
             # Add GPU metrics if available
             try:
                 import GPUtil
                 gpus = GPUtil.getGPUs()
                 if gpus:
-                    metrics['gpu_utilization'] = gpus[0].load * 100
-                    metrics['gpu_memory'] = gpus[0].memoryUtil * 100
+                    self._gpu_util[slot] = gpus[0].load * 100
+                    self._gpu_mem[slot] = gpus[0].memoryUtil * 100
             except:
                 pass
-            
-            self.system_metrics.append(metrics)
-            
+
+            self._n += 1
+
             # Log if thresholds exceeded
-            if metrics['cpu_percent'] > 80:
-                self.logger.warning(f"High CPU usage: {metrics['cpu_percent']:.1f}%")
-            if metrics['memory_percent'] > 80:
-                self.logger.warning(f"High memory usage: {metrics['memory_percent']:.1f}%")
-            
+            if cpu > 80:
+                self.logger.warning(f"High CPU usage: {cpu:.1f}%")
+            if mem > 80:
+                self.logger.warning(f"High memory usage: {mem:.1f}%")
+
         except Exception as e:
             self.logger.error(f"Error collecting system metrics: {str(e)}")
     
@@ -140,31 +175,33 @@ class AutomatedMonitor:
         Returns:
             Dictionary with system health metrics
         """
-        if not self.system_metrics:
+        if not self._n:
             return {
                 'status': 'no_data',
                 'message': 'No monitoring data available'
             }
-        
-        latest = self.system_metrics[-1]
-        
+
+        slot = (self._n - 1) % self._capacity
+        cpu = float(self._cpu[slot])
+        mem = float(self._mem[slot])
+
         # Determine health status
-        cpu_ok = latest['cpu_percent'] < 80
-        mem_ok = latest['memory_percent'] < 80
-        
+        cpu_ok = cpu < 80
+        mem_ok = mem < 80
+
         if cpu_ok and mem_ok:
             status = 'healthy'
         elif cpu_ok or mem_ok:
             status = 'warning'
         else:
             status = 'critical'
-        
+
         return {
             'status': status,
-            'timestamp': latest['timestamp'],
-            'cpu_percent': latest['cpu_percent'],
-            'memory_percent': latest['memory_percent'],
-            'disk_usage': latest['disk_usage']
+            'timestamp': self._ts[slot].astype(datetime),
+            'cpu_percent': cpu,
+            'memory_percent': mem,
+            'disk_usage': float(self._disk[slot])
         }
     
     def get_performance_summary(self) -> Dict[str, Any]:
@@ -176,29 +213,24 @@ class AutomatedMonitor:
         """
         if not self.model_metrics:
             return {'message': 'No performance data available'}
-        
-        # Calculate average metrics per model
-        model_summaries = {}
-        
-        for entry in self.model_metrics:
-            model_name = entry['model_name']
-            if model_name not in model_summaries:
-                model_summaries[model_name] = []
-            model_summaries[model_name].append(entry)
-        
+
+        # One vectorized groupby over all entries instead of Python loops
+        # per model and per metric; ddof=0 matches np.std
+        df = pd.DataFrame(self.model_metrics).drop(columns=['timestamp'])
+        grouped = df.groupby('model_name')
+        means = grouped.mean(numeric_only=True)
+        stds = grouped.std(numeric_only=True, ddof=0)
+
         summary = {}
-        for model_name, entries in model_summaries.items():
-            # Calculate averages
+        for model_name in means.index:
             metrics = {}
-            for key in entries[0].keys():
-                if key not in ['timestamp', 'model_name']:
-                    values = [e[key] for e in entries if isinstance(e.get(key), (int, float))]
-                    if values:
-                        metrics[f'avg_{key}'] = np.mean(values)
-                        metrics[f'std_{key}'] = np.std(values)
-            
+            for col in means.columns:
+                mean_val = means.at[model_name, col]
+                if pd.notna(mean_val):
+                    metrics[f'avg_{col}'] = float(mean_val)
+                    metrics[f'std_{col}'] = float(stds.at[model_name, col])
             summary[model_name] = metrics
-        
+
         return summary
     
     def print_summary(self):
@@ -207,16 +239,16 @@ class AutomatedMonitor:
         print("Monitoring Summary")
         print(f"{'='*60}")
         
-        # System metrics summary
-        if self.system_metrics:
-            cpu_values = [m['cpu_percent'] for m in self.system_metrics]
-            mem_values = [m['memory_percent'] for m in self.system_metrics]
-            
+        # System metrics summary: direct reductions on the ring columns
+        if self._n:
+            cpu_values = self._metric_column(self._cpu)
+            mem_values = self._metric_column(self._mem)
+
             print("\nSystem Metrics:")
-            print(f"  Avg CPU Usage: {np.mean(cpu_values):.2f}%")
-            print(f"  Max CPU Usage: {np.max(cpu_values):.2f}%")
-            print(f"  Avg Memory Usage: {np.mean(mem_values):.2f}%")
-            print(f"  Max Memory Usage: {np.max(mem_values):.2f}%")
+            print(f"  Avg CPU Usage: {cpu_values.mean():.2f}%")
+            print(f"  Max CPU Usage: {cpu_values.max():.2f}%")
+            print(f"  Avg Memory Usage: {mem_values.mean():.2f}%")
+            print(f"  Max Memory Usage: {mem_values.max():.2f}%")
         
         # Model performance summary
         if self.model_metrics:
@@ -247,20 +279,49 @@ class AutomatedMonitor:
         """
         import json
         
-        export_data = {
-            'system_metrics': [
-                {k: str(v) if isinstance(v, datetime) else v 
-                 for k, v in m.items()}
-                for m in self.system_metrics
-            ],
-            'model_metrics': [
-                {k: str(v) if isinstance(v, datetime) else v 
-                 for k, v in m.items()}
-                for m in self.model_metrics
-            ]
-        }
-        
-        with open(filepath, 'w') as f:
-            json.dump(export_data, f, indent=2)
-        
+        # Rebuild row dicts from the ring columns (cold path, export only)
+        ts = self._metric_column(self._ts)
+        cpu = self._metric_column(self._cpu)
+        mem = self._metric_column(self._mem)
+        disk = self._metric_column(self._disk)
+        gpu_util = self._metric_column(self._gpu_util)
+        gpu_mem = self._metric_column(self._gpu_mem)
+
+        system_metrics = []
+        for i in range(len(ts)):
+            entry = {
+                'timestamp': str(ts[i]),
+                'cpu_percent': float(cpu[i]),
+                'memory_percent': float(mem[i]),
+                'disk_usage': float(disk[i])
+            }
+            if not np.isnan(gpu_util[i]):
+                entry['gpu_utilization'] = float(gpu_util[i])
+                entry['gpu_memory'] = float(gpu_mem[i])
+            system_metrics.append(entry)
+
+        if _ORJSON_AVAILABLE:
+            # orjson serializes datetimes and numpy scalars natively, so
+            # model_metrics goes out without the per-entry dict copies
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(
+                    {
+                        'system_metrics': system_metrics,
+                        'model_metrics': self.model_metrics
+                    },
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+                ))
+        else:
+            export_data = {
+                'system_metrics': system_metrics,
+                'model_metrics': [
+                    {k: str(v) if isinstance(v, datetime) else v
+                     for k, v in m.items()}
+                    for m in self.model_metrics
+                ]
+            }
+
+            with open(filepath, 'w') as f:
+                json.dump(export_data, f, indent=2)
+
         self.logger.info(f"Metrics exported to {filepath}")
\ No newline at end of file
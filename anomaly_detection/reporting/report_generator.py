@@ -2,13 +2,25 @@
 Detection report generator for PDF and CSV exports.
 """
 
+import csv
+import heapq
+import operator
 import os
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 import sqlite3
 import pandas as pd
 from io import BytesIO
 
+try:
+    import pyarrow as pa
+    import pyarrow.feather
+    import pyarrow.parquet
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
+
 try:
     from reportlab.lib.pagesizes import letter, A4
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -17,11 +29,37 @@ try:
     from reportlab.lib import colors
     from reportlab.lib.enums import TA_CENTER, TA_LEFT
     REPORTLAB_AVAILABLE = True
+    # Spacers are stateless; reportlab is fine with shared instances, so
+    # one of each size serves every report instead of a fresh allocation
+    # per story entry
+    _SPACER_SM = Spacer(1, 0.1 * inch)
+    _SPACER_MD = Spacer(1, 0.2 * inch)
+    _SPACER_LG = Spacer(1, 0.3 * inch)
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
 from ..utils.logger import LoggerFactory
-from ..persistence.db import DatabaseManager
+from ..persistence.db import DatabaseManager, raw_packet_text
+
+# matplotlib costs hundreds of ms to import; load it once on first
+# chart instead of per report, configured for headless Agg rendering
+_plt = None
+
+
+def _get_plt():
+    """Return pyplot, importing and configuring it on first use."""
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        # Simplify long polylines before rasterizing and chunk big paths
+        # so dense timeline plots render fast without visible change
+        plt.rcParams['path.simplify'] = True
+        plt.rcParams['path.simplify_threshold'] = 1.0
+        plt.rcParams['agg.path.chunksize'] = 10000
+        _plt = plt
+    return _plt
 
 
 class ReportGenerator:
@@ -37,6 +75,15 @@ class ReportGenerator:
         self.config = config
         self.logger = LoggerFactory.get_logger('ReportGenerator')
         self.db_manager = DatabaseManager(config)
+        # Table styles are immutable; build them once per generator
+        # instead of reallocating the command list for every table
+        self._table_style = None
+        self._metadata_table_style = None
+        # Generated reports keyed by (dates, format, path) plus a
+        # COUNT/MAX(timestamp) fingerprint: polling UIs re-request the
+        # same window, so unchanged data returns the existing file
+        self._report_cache: 'OrderedDict[Tuple, Tuple[Tuple, Dict[str, Any]]]' = OrderedDict()
+        self._report_cache_max = 8
     
     def generate_report(
         self,
@@ -48,10 +95,11 @@ class ReportGenerator:
     ) -> Dict[str, Any]:
         """
         Generate detection report.
-        
+
         Args:
             output_path: Output file path
-            format: Report format ('pdf' or 'csv')
+            format: Report format ('pdf', 'csv', 'parquet' or 'feather';
+                the latter two require pyarrow)
             start_date: Optional start date filter
             end_date: Optional end date filter
             include_charts: Include visualizations in PDF (requires matplotlib)
@@ -60,31 +108,47 @@ class ReportGenerator:
             Result dictionary with status and file path
         """
         try:
-            # Query detections
-            detections = self._query_detections(start_date, end_date)
-            
-            if not detections:
-                return {
-                    'status': 'no_data',
-                    'message': 'No detections found for the specified date range'
-                }
-            
-            # Generate report based on format
+            # Cheap fingerprint (index-backed COUNT/MAX): if the window's
+            # data hasn't advanced since the cached build and the file is
+            # still on disk, skip the whole pipeline
+            cache_key = (start_date, end_date, format.lower(), output_path)
+            fingerprint = self._data_fingerprint(start_date, end_date)
+            if fingerprint is not None:
+                cached = self._report_cache.get(cache_key)
+                if cached is not None and cached[0] == fingerprint and os.path.exists(output_path):
+                    self._report_cache.move_to_end(cache_key)
+                    return cached[1]
+
+            # Generate report based on format. The PDF path works from SQL
+            # aggregates so row count never inflates report memory; CSV
+            # needs the full rows regardless.
             if format.lower() == 'pdf':
                 if not REPORTLAB_AVAILABLE:
                     return {
                         'status': 'error',
                         'message': 'reportlab not installed. Install with: pip install reportlab'
                     }
-                result = self._generate_pdf_report(output_path, detections, include_charts)
-            elif format.lower() == 'csv':
-                result = self._generate_csv_report(output_path, detections)
+                aggregates = self._query_aggregates(start_date, end_date)
+                if not aggregates['total']:
+                    return {
+                        'status': 'no_data',
+                        'message': 'No detections found for the specified date range'
+                    }
+                result = self._generate_pdf_report(output_path, aggregates, include_charts)
+            elif format.lower() in ('csv', 'parquet', 'feather'):
+                result = self._generate_export(output_path, format.lower(), start_date, end_date)
             else:
                 return {
                     'status': 'error',
                     'message': f'Unsupported format: {format}'
                 }
-            
+
+            if fingerprint is not None and result.get('status') == 'success':
+                self._report_cache[cache_key] = (fingerprint, result)
+                self._report_cache.move_to_end(cache_key)
+                while len(self._report_cache) > self._report_cache_max:
+                    self._report_cache.popitem(last=False)
+
             return result
             
         except Exception as e:
@@ -94,98 +158,261 @@ class ReportGenerator:
                 'message': str(e)
             }
     
-    def _query_detections(
+    @staticmethod
+    def _date_filter(
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> Tuple[str, List[Any]]:
+        """Build the shared WHERE clause for a date window."""
+        where = "WHERE 1=1"
+        params: List[Any] = []
+        if start_date:
+            where += " AND timestamp >= ?"
+            params.append(start_date.isoformat())
+        if end_date:
+            where += " AND timestamp <= ?"
+            params.append(end_date.isoformat())
+        return where, params
+
+    def _data_fingerprint(
         self,
         start_date: Optional[datetime],
         end_date: Optional[datetime]
-    ) -> List[Dict[str, Any]]:
+    ) -> Optional[Tuple]:
         """
-        Query detections from database.
-        
+        Fingerprint the detections in a date window for cache validation.
+
+        COUNT(*) plus MAX(timestamp) changes whenever a row lands in the
+        window, and both come straight off the timestamp index. Returns
+        None when the table isn't queryable (caching is then skipped).
+        """
+        where, params = self._date_filter(start_date, end_date)
+        try:
+            return tuple(self.db_manager.get_connection().execute(
+                f"SELECT COUNT(*), MAX(timestamp) FROM detections {where}", params
+            ).fetchone())
+        except sqlite3.Error:
+            return None
+
+    def _query_cursor(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> sqlite3.Cursor:
+        """
+        Open a streaming cursor over the detections in the date range.
+
+        Rows are consumed as SQLite yields them, so exports never hold
+        the full result set in memory. The underlying connection is the
+        DatabaseManager's shared one and must not be closed.
+
         Args:
             start_date: Optional start date
             end_date: Optional end date
-            
+
         Returns:
-            List of detection dictionaries
+            Live cursor ordered newest first
         """
-        db_path = self.config.get('persistence', {}).get('db_path', 'data/detections.db')
-        
-        conn = sqlite3.connect(db_path)
+        # Shared long-lived connection: warm page cache across reports,
+        # owned (and eventually closed) by the DatabaseManager
+        conn = self.db_manager.get_connection()
         conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM detections WHERE 1=1"
-        params = []
-        
-        if start_date:
-            query += " AND timestamp >= ?"
-            params.append(start_date.isoformat())
-        
-        if end_date:
-            query += " AND timestamp <= ?"
-            params.append(end_date.isoformat())
-        
-        query += " ORDER BY timestamp DESC"
-        
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        
-        detections = [dict(row) for row in rows]
-        
-        conn.close()
-        
-        return detections
-    
-    def _generate_csv_report(
+
+        where, params = self._date_filter(start_date, end_date)
+        return conn.execute(
+            f"SELECT * FROM detections {where} ORDER BY timestamp DESC", params
+        )
+
+    def _query_aggregates(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> Dict[str, Any]:
+        """
+        Aggregate detections in SQL instead of materializing every row.
+
+        SQLite's C-level GROUP BY does the counting, so Python only sees
+        one row per severity/protocol/source plus the 50 most recent
+        detections — report memory stays flat regardless of table size.
+
+        Args:
+            start_date: Optional start date
+            end_date: Optional end date
+
+        Returns:
+            Dictionary of aggregate statistics for the PDF report
+        """
+        conn = self.db_manager.get_connection()
+        conn.row_factory = sqlite3.Row
+
+        where, params = self._date_filter(start_date, end_date)
+
+        # Indexes so the range filter and source grouping don't
+        # table-scan (no-ops once created)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_detections_ts ON detections(timestamp)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_detections_src ON detections(source_ip)"
+        )
+
+        total, unique_sources, first_ts, last_ts = conn.execute(
+            f"SELECT COUNT(*), COUNT(DISTINCT source_ip), MIN(timestamp), MAX(timestamp) "
+            f"FROM detections {where}",
+            params
+        ).fetchone()
+
+        by_severity = dict(conn.execute(
+            f"SELECT COALESCE(severity, 'unknown'), COUNT(*) "
+            f"FROM detections {where} GROUP BY severity",
+            params
+        ).fetchall())
+
+        by_protocol = dict(conn.execute(
+            f"SELECT COALESCE(protocol, 'unknown'), COUNT(*) "
+            f"FROM detections {where} GROUP BY protocol",
+            params
+        ).fetchall())
+
+        top_sources = [tuple(row) for row in conn.execute(
+            f"SELECT COALESCE(source_ip, 'unknown'), COUNT(*) AS c "
+            f"FROM detections {where} GROUP BY source_ip ORDER BY c DESC LIMIT 10",
+            params
+        ).fetchall()]
+
+        timeline = dict(conn.execute(
+            f"SELECT date(timestamp), COUNT(*) "
+            f"FROM detections {where} GROUP BY date(timestamp) ORDER BY date(timestamp)",
+            params
+        ).fetchall())
+
+        # Rows come back already shaped for the PDF table: trimmed
+        # timestamp, N/A fills, display column order
+        recent = [tuple(row) for row in conn.execute(
+            f"SELECT substr(timestamp, 1, 19), COALESCE(source_ip, 'N/A'), "
+            f"COALESCE(dest_ip, 'N/A'), COALESCE(protocol, 'N/A'), COALESCE(severity, 'N/A') "
+            f"FROM detections {where} ORDER BY timestamp DESC LIMIT 50",
+            params
+        ).fetchall()]
+
+        return {
+            'total': total,
+            'unique_sources': unique_sources,
+            'first_ts': first_ts,
+            'last_ts': last_ts,
+            'by_severity': by_severity,
+            'by_attack_type': {},
+            'by_protocol': by_protocol,
+            'top_sources': top_sources,
+            'timeline': timeline,
+            'recent': recent
+        }
+
+    def _generate_export(
         self,
         output_path: str,
-        detections: List[Dict[str, Any]]
+        fmt: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
     ) -> Dict[str, Any]:
         """
-        Generate CSV report.
-        
+        Export detections as CSV, Parquet or Feather.
+
+        CSV streams straight from the SQLite cursor with the C csv
+        writer — no list-of-dicts or DataFrame round trip, so memory
+        stays flat for any row count. Parquet/Feather (via pyarrow)
+        trade a columnar build for much smaller, faster-loading files.
+
         Args:
             output_path: Output file path
-            detections: List of detections
-            
+            fmt: 'csv', 'parquet' or 'feather'
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+
         Returns:
             Result dictionary
         """
+        cursor = self._query_cursor(start_date, end_date)
         try:
-            df = pd.DataFrame(detections)
-            df.to_csv(output_path, index=False)
-            
-            self.logger.info(f"CSV report generated: {output_path}")
-            
+            first = cursor.fetchone()
+            if first is None:
+                return {
+                    'status': 'no_data',
+                    'message': 'No detections found for the specified date range'
+                }
+            columns = first.keys()
+
+            # raw_packet is stored zstd-compressed when zstandard is
+            # available; decode it back to text so CSV cells aren't byte
+            # reprs and the arrow columns stay a single type across old
+            # and new rows
+            raw_idx = list(columns).index('raw_packet') if 'raw_packet' in columns else -1
+            if raw_idx >= 0:
+                def _export_row(row):
+                    values = list(row)
+                    values[raw_idx] = raw_packet_text(values[raw_idx])
+                    return values
+            else:
+                _export_row = tuple
+
+            if fmt == 'csv':
+                count = 1
+                with open(output_path, 'w', newline='') as f:
+                    writer = csv.writer(f, lineterminator='\n')
+                    writer.writerow(columns)
+                    writer.writerow(_export_row(first))
+                    for row in cursor:
+                        writer.writerow(_export_row(row))
+                        count += 1
+            else:
+                if not _PYARROW_AVAILABLE:
+                    return {
+                        'status': 'error',
+                        'message': 'pyarrow not installed. Install with: pip install pyarrow'
+                    }
+                rows = [_export_row(first)] + [_export_row(row) for row in cursor]
+                table = pa.Table.from_arrays(
+                    [pa.array(col) for col in zip(*rows)], names=list(columns)
+                )
+                count = table.num_rows
+                if fmt == 'parquet':
+                    pa.parquet.write_table(table, output_path, compression='zstd')
+                else:
+                    pa.feather.write_feather(table, output_path)
+
+            self.logger.info(f"{fmt.upper()} report generated: {output_path}")
+
             return {
                 'status': 'success',
                 'file_path': output_path,
-                'format': 'csv',
-                'detection_count': len(detections)
+                'format': fmt,
+                'detection_count': count
             }
-            
+
         except Exception as e:
-            self.logger.error(f"CSV generation failed: {e}")
+            self.logger.error(f"{fmt.upper()} generation failed: {e}")
             return {
                 'status': 'error',
                 'message': str(e)
             }
+        finally:
+            # The shared connection stays open; just release the cursor
+            cursor.close()
     
     def _generate_pdf_report(
         self,
         output_path: str,
-        detections: List[Dict[str, Any]],
+        aggregates: Dict[str, Any],
         include_charts: bool
     ) -> Dict[str, Any]:
         """
         Generate PDF report.
-        
+
         Args:
             output_path: Output file path
-            detections: List of detections
+            aggregates: Aggregate statistics from _query_aggregates
             include_charts: Include visualizations
-            
+
         Returns:
             Result dictionary
         """
@@ -205,12 +432,12 @@ class ReportGenerator:
                 spaceAfter=30
             )
             story.append(Paragraph("Network Anomaly Detection Report", title_style))
-            story.append(Spacer(1, 0.2 * inch))
+            story.append(_SPACER_MD)
             
             # Report metadata
-            metadata = self._generate_metadata(detections)
+            metadata = self._generate_metadata(aggregates)
             story.append(Paragraph("<b>Report Details</b>", styles['Heading2']))
-            story.append(Spacer(1, 0.1 * inch))
+            story.append(_SPACER_SM)
             
             metadata_data = [
                 ['Generated:', metadata['generated']],
@@ -221,90 +448,78 @@ class ReportGenerator:
             ]
             
             metadata_table = Table(metadata_data, colWidths=[2*inch, 4*inch])
-            metadata_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
+            metadata_table.setStyle(self._get_metadata_table_style())
             story.append(metadata_table)
-            story.append(Spacer(1, 0.3 * inch))
+            story.append(_SPACER_LG)
             
-            # Summary statistics
-            stats = self._generate_statistics(detections)
+            # Summary statistics (already grouped by SQL)
+            stats = aggregates
             story.append(Paragraph("<b>Summary Statistics</b>", styles['Heading2']))
-            story.append(Spacer(1, 0.1 * inch))
+            story.append(_SPACER_SM)
             
             # By severity
             story.append(Paragraph("<i>By Severity</i>", styles['Heading3']))
-            severity_data = [['Severity', 'Count', 'Percentage']]
-            for severity, count in stats['by_severity'].items():
-                pct = (count / stats['total']) * 100
-                severity_data.append([severity, str(count), f"{pct:.1f}%"])
-            
+            severity_data = [['Severity', 'Count', 'Percentage']] + [
+                [severity, str(count), f"{count / stats['total'] * 100:.1f}%"]
+                for severity, count in stats['by_severity'].items()
+            ]
+
             severity_table = Table(severity_data, colWidths=[2*inch, 2*inch, 2*inch])
             severity_table.setStyle(self._get_table_style())
             story.append(severity_table)
-            story.append(Spacer(1, 0.2 * inch))
+            story.append(_SPACER_MD)
             
             # By attack type
             if stats['by_attack_type']:
                 story.append(Paragraph("<i>By Attack Type</i>", styles['Heading3']))
-                attack_data = [['Attack Type', 'Count', 'Percentage']]
-                for attack_type, count in sorted(stats['by_attack_type'].items(), key=lambda x: x[1], reverse=True)[:10]:
-                    pct = (count / stats['total']) * 100
-                    attack_data.append([attack_type, str(count), f"{pct:.1f}%"])
-                
+                attack_data = [['Attack Type', 'Count', 'Percentage']] + [
+                    [attack_type, str(count), f"{count / stats['total'] * 100:.1f}%"]
+                    for attack_type, count in heapq.nlargest(
+                        10, stats['by_attack_type'].items(), key=operator.itemgetter(1)
+                    )
+                ]
+
                 attack_table = Table(attack_data, colWidths=[2*inch, 2*inch, 2*inch])
                 attack_table.setStyle(self._get_table_style())
                 story.append(attack_table)
-                story.append(Spacer(1, 0.2 * inch))
+                story.append(_SPACER_MD)
             
             # Top source IPs
             story.append(Paragraph("<i>Top Source IPs</i>", styles['Heading3']))
-            top_sources_data = [['Source IP', 'Detection Count']]
-            for ip, count in stats['top_sources'][:10]:
-                top_sources_data.append([ip, str(count)])
-            
+            top_sources_data = [['Source IP', 'Detection Count']] + [
+                [ip, str(count)] for ip, count in stats['top_sources'][:10]
+            ]
+
             top_sources_table = Table(top_sources_data, colWidths=[3*inch, 3*inch])
             top_sources_table.setStyle(self._get_table_style())
             story.append(top_sources_table)
-            story.append(Spacer(1, 0.3 * inch))
+            story.append(_SPACER_LG)
             
             # Charts
             if include_charts:
                 try:
-                    chart_images = self._generate_charts(detections)
+                    chart_images = self._generate_charts(aggregates['timeline'])
                     if chart_images:
                         story.append(PageBreak())
                         story.append(Paragraph("<b>Visualizations</b>", styles['Heading2']))
-                        story.append(Spacer(1, 0.2 * inch))
+                        story.append(_SPACER_MD)
                         
                         for chart_img in chart_images:
                             img = Image(chart_img, width=6*inch, height=4*inch)
                             story.append(img)
-                            story.append(Spacer(1, 0.3 * inch))
+                            story.append(_SPACER_LG)
                 except Exception as e:
                     self.logger.warning(f"Chart generation failed: {e}")
             
             # Recent detections
             story.append(PageBreak())
             story.append(Paragraph("<b>Recent Detections (Last 50)</b>", styles['Heading2']))
-            story.append(Spacer(1, 0.1 * inch))
-            
-            recent_data = [['Timestamp', 'Source', 'Dest', 'Protocol', 'Severity']]
-            for detection in detections[:50]:
-                recent_data.append([
-                    detection.get('timestamp', '')[:19],
-                    detection.get('src_ip', 'N/A'),
-                    detection.get('dst_ip', 'N/A'),
-                    detection.get('protocol', 'N/A'),
-                    detection.get('severity', 'N/A')
-                ])
+            story.append(_SPACER_SM)
             
+            # Rows already arrive trimmed and N/A-filled from SQL
+            recent_data = [('Timestamp', 'Source', 'Dest', 'Protocol', 'Severity')]
+            recent_data.extend(aggregates['recent'])
+
             recent_table = Table(recent_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch, 1*inch, 1*inch])
             recent_table.setStyle(self._get_table_style())
             story.append(recent_table)
@@ -318,7 +533,7 @@ class ReportGenerator:
                 'status': 'success',
                 'file_path': output_path,
                 'format': 'pdf',
-                'detection_count': len(detections)
+                'detection_count': aggregates['total']
             }
             
         except Exception as e:
@@ -328,107 +543,80 @@ class ReportGenerator:
                 'message': str(e)
             }
     
-    def _get_table_style(self) -> TableStyle:
-        """Get standard table style."""
-        return TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ])
+    def _get_table_style(self) -> 'TableStyle':
+        """Get standard table style (built once, shared by every table)."""
+        if self._table_style is None:
+            self._table_style = TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 12),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ])
+        return self._table_style
+
+    def _get_metadata_table_style(self) -> 'TableStyle':
+        """Get metadata table style (built once)."""
+        if self._metadata_table_style is None:
+            self._metadata_table_style = TableStyle([
+                ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ])
+        return self._metadata_table_style
     
-    def _generate_metadata(self, detections: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Generate report metadata."""
-        timestamps = [d.get('timestamp', '') for d in detections if d.get('timestamp')]
-        
+    def _generate_metadata(self, aggregates: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate report metadata from the SQL aggregates."""
         date_range = 'N/A'
-        if timestamps:
-            sorted_times = sorted(timestamps)
-            date_range = f"{sorted_times[0][:10]} to {sorted_times[-1][:10]}"
-        
-        unique_sources = len(set(d.get('src_ip', '') for d in detections if d.get('src_ip')))
-        
+        if aggregates['first_ts'] and aggregates['last_ts']:
+            date_range = f"{aggregates['first_ts'][:10]} to {aggregates['last_ts'][:10]}"
+
         return {
             'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'date_range': date_range,
-            'total_detections': len(detections),
-            'unique_sources': unique_sources,
+            'total_detections': aggregates['total'],
+            'unique_sources': aggregates['unique_sources'],
             'anomaly_rate': 100.0  # All records are anomalies
         }
-    
-    def _generate_statistics(self, detections: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Generate statistics from detections."""
-        stats = {
-            'total': len(detections),
-            'by_severity': {},
-            'by_attack_type': {},
-            'by_protocol': {},
-            'top_sources': []
-        }
-        
-        # Count by severity
-        for detection in detections:
-            severity = detection.get('severity', 'unknown')
-            stats['by_severity'][severity] = stats['by_severity'].get(severity, 0) + 1
-        
-        # Count by attack type
-        for detection in detections:
-            attack_type = detection.get('attack_type', 'unknown')
-            if attack_type:
-                stats['by_attack_type'][attack_type] = stats['by_attack_type'].get(attack_type, 0) + 1
-        
-        # Count by protocol
-        for detection in detections:
-            protocol = detection.get('protocol', 'unknown')
-            stats['by_protocol'][protocol] = stats['by_protocol'].get(protocol, 0) + 1
-        
-        # Top source IPs
-        source_counts = {}
-        for detection in detections:
-            src_ip = detection.get('src_ip', 'unknown')
-            source_counts[src_ip] = source_counts.get(src_ip, 0) + 1
-        
-        stats['top_sources'] = sorted(source_counts.items(), key=lambda x: x[1], reverse=True)
-        
-        return stats
-    
-    def _generate_charts(self, detections: List[Dict[str, Any]]) -> List[BytesIO]:
+
+    def _generate_charts(self, timeline: Dict[str, int]) -> List[BytesIO]:
         """
         Generate charts for PDF report.
-        
+
         Args:
-            detections: List of detections
-            
+            timeline: Per-day detection counts from _query_aggregates
+
         Returns:
             List of image buffers
         """
         try:
-            import matplotlib
-            matplotlib.use('Agg')
-            import matplotlib.pyplot as plt
-            
+            plt = _get_plt()
+
             chart_images = []
-            
-            # Timeline chart
-            df = pd.DataFrame(detections)
-            if 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df['date'] = df['timestamp'].dt.date
-                daily_counts = df.groupby('date').size()
-                
+
+            # Timeline chart: counts are already grouped per day by SQL,
+            # so plot the O(days) pairs directly — no timestamp parsing
+            if timeline:
+                dates, counts = zip(*timeline.items())
+
                 fig, ax = plt.subplots(figsize=(8, 5))
-                daily_counts.plot(kind='line', ax=ax, marker='o')
+                ax.plot(dates, counts, marker='o')
                 ax.set_title('Detections Timeline')
                 ax.set_xlabel('Date')
                 ax.set_ylabel('Detection Count')
                 ax.grid(True, alpha=0.3)
                 
                 buf = BytesIO()
-                plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
+                # 72 dpi is screen resolution — the viewing target for
+                # these reports — and quarters the pixels to encode/embed
+                plt.savefig(buf, format='png', dpi=72, bbox_inches='tight')
                 buf.seek(0)
                 chart_images.append(buf)
                 plt.close()
@@ -3,20 +3,252 @@ Threat intelligence feed integration.
 Enriches detections with threat data from external sources.
 """
 
+import asyncio
+import functools
+import ipaddress
+import json
+import os
+import sqlite3
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Optional, Tuple
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+import threading
 import time
 from ..utils.logger import LoggerFactory
 
+try:
+    import aiohttp
+    _AIOHTTP_AVAILABLE = True
+except Exception:
+    _AIOHTTP_AVAILABLE = False
+
+try:
+    import diskcache
+    _DISKCACHE_AVAILABLE = True
+except Exception:
+    _DISKCACHE_AVAILABLE = False
+
+
+class _DiskCache:
+    """Persistent TTL cache so restarts keep warm threat-intel state.
+
+    Backed by diskcache when installed, otherwise by a small WAL-mode
+    SQLite table (matching the persistence layer) holding JSON values
+    with an absolute expiry. A disk hit costs tens of microseconds
+    against a ~200 ms API round-trip, and the directory can be shared
+    by a fleet of enricher processes.
+    """
+
+    def __init__(self, directory: str, ttl: float):
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+        if _DISKCACHE_AVAILABLE:
+            self._dc = diskcache.Cache(directory, size_limit=512 << 20)
+            self._conn = None
+        else:
+            self._dc = None
+            self._conn = sqlite3.connect(
+                os.path.join(directory, 'ti_cache.db'),
+                check_same_thread=False, timeout=5
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ti_cache ("
+                "  key TEXT PRIMARY KEY,"
+                "  value TEXT NOT NULL,"
+                "  expires_at REAL NOT NULL"
+                ")"
+            )
+            self._conn.commit()
+
+    def get(self, key, default=None):
+        if self._dc is not None:
+            return self._dc.get(key, default=default)
+        row = self._conn.execute(
+            "SELECT value, expires_at FROM ti_cache WHERE key=?", (key,)
+        ).fetchone()
+        if row is None:
+            return default
+        value, expires_at = row
+        if expires_at < time.time():
+            self._conn.execute("DELETE FROM ti_cache WHERE key=?", (key,))
+            self._conn.commit()
+            return default
+        return json.loads(value)
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        lifetime = self.ttl if ttl is None else ttl
+        if self._dc is not None:
+            self._dc.set(key, value, expire=lifetime)
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO ti_cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time() + lifetime)
+        )
+        self._conn.commit()
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+
+class _TokenBucket:
+    """Token-bucket rate limiter shared by the sync and async paths.
+
+    Capacity equals the per-period quota, so short bursts pass
+    immediately while sustained load is smoothed to the provider's
+    documented rate instead of hammering into 429 responses. acquire()
+    sleeps the calling thread; acquire_async() yields to the event loop.
+    """
+
+    def __init__(self, rate: float, period: float):
+        self.capacity = max(1.0, rate)
+        self._fill_rate = self.capacity / period
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token, returning how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self._fill_rate
+            )
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._fill_rate
+
+    def penalize(self, seconds: float):
+        """Push the next token out by at least `seconds` (Retry-After)."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._tokens, -seconds * self._fill_rate)
+            self._updated = now
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class _TTLCache:
+    """Bounded LRU cache with per-entry time-to-live.
+
+    Inserts past maxsize evict the least recently used entry, and
+    expired entries read as misses. Unlike cachetools.TTLCache, each
+    entry may carry its own lifetime — the basis for adaptive TTLs.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()  # key -> (value, expires_at)
+
+    def get(self, key, default=None):
+        item = self._data.get(key)
+        if item is None:
+            return default
+        value, expires_at = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        if key in self._data:
+            self._data.move_to_end(key)
+        elif len(self._data) >= self.maxsize:
+            self._data.popitem(last=False)
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+# One pooled session per event loop: the TCPConnector keeps connections
+# and resolved DNS warm across lookups, so repeat calls to the same API
+# host skip the TCP+TLS handshake entirely
+_sessions: Dict[Any, Any] = {}
+
+# Most TI APIs cap bulk submissions around 100 IPs; batches are chunked
+# to this size before dispatch
+_BATCH_SIZE = 100
+
+
+@functools.lru_cache(maxsize=65536)
+def _is_lookupable(ip: str) -> bool:
+    """
+    Whether an IP is worth sending to a remote reputation API.
+
+    RFC1918, loopback, link-local, multicast and other non-global
+    addresses are guaranteed "unknown" responses that waste quota and a
+    network round-trip each. Memoized so repeated address strings skip
+    the parse entirely.
+    """
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return addr.is_global and not addr.is_multicast
+
+
+def _run(coro):
+    """Run a coroutine on a fresh loop, closing the loop's shared session.
+
+    Sync entry points each get a short-lived event loop from
+    asyncio.run; without the close, every call would strand an open
+    ClientSession keyed by its dead loop.
+    """
+    async def _wrapped():
+        try:
+            return await coro
+        finally:
+            session = _sessions.pop(asyncio.get_running_loop(), None)
+            if session is not None:
+                await session.close()
+    return asyncio.run(_wrapped())
+
+
+def _get_session():
+    """Return the shared aiohttp session for the running event loop."""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100, limit_per_host=4, ttl_dns_cache=300
+            )
+        )
+        _sessions[loop] = session
+    return session
+
 
 class ThreatIntelProvider(ABC):
     """Base class for threat intelligence providers."""
-    
+
+    PROVIDER_NAME = 'unknown'
+
+    # Documented quota: RATE_LIMIT requests per RATE_PERIOD seconds,
+    # overridable via the rate_limit/rate_period config keys
+    RATE_LIMIT = 60
+    RATE_PERIOD = 60.0
+
     def __init__(self, api_key: str, config: Dict[str, Any]):
         """
         Initialize provider.
-        
+
         Args:
             api_key: API key for the service
             config: Provider-specific configuration
@@ -24,181 +256,353 @@ class ThreatIntelProvider(ABC):
         self.api_key = api_key
         self.config = config
         self.logger = LoggerFactory.get_logger(self.__class__.__name__)
-        self.cache = {}
         self.cache_ttl = config.get('cache_ttl', 3600)  # 1 hour default
-    
+        # Bounded LRU+TTL cache: a plain dict grows without bound on a
+        # sensor seeing millions of unique IPs, while hot IPs stay
+        # resident under eviction. Guarded by a lock since enrichment
+        # may run from a worker pool.
+        maxsize = config.get('cache_maxsize', 50_000)
+        # Disk-backed by default so a pipeline restart doesn't re-query
+        # every IP from scratch; cache_dir=None keeps it process-local
+        cache_dir = config.get('cache_dir', 'data/ti_cache')
+        if cache_dir:
+            self.cache = _DiskCache(
+                os.path.join(cache_dir, self.__class__.__name__), self.cache_ttl
+            )
+        else:
+            self.cache = _TTLCache(maxsize, self.cache_ttl)
+        self._cache_lock = threading.Lock()
+        # Revalidation store: ETag/Last-Modified plus the stale payload,
+        # kept well past the freshness TTL. An expired entry turns into
+        # a conditional request, and a 304 refreshes the cache without
+        # re-downloading or re-parsing the payload.
+        self._validators = _TTLCache(maxsize, self.cache_ttl * 24)
+        self.bucket = _TokenBucket(
+            config.get('rate_limit', self.RATE_LIMIT),
+            config.get('rate_period', self.RATE_PERIOD)
+        )
+        # Keep-alive session: lookups hit one API host with ~1 KB
+        # responses, so the TCP+TLS handshake dominates wall time.
+        # Pooling the connection turns repeat calls into a single RTT,
+        # and the mounted retries absorb transient 429/5xx responses.
+        self._headers = self._default_headers()
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        ))
+        self.session.headers.update(self._headers)
+
     @abstractmethod
-    def lookup_ip(self, ip_address: str) -> Dict[str, Any]:
-        """
-        Lookup IP reputation.
-        
-        Args:
-            ip_address: IP address to lookup
-            
-        Returns:
-            Threat intelligence data
-        """
+    def _default_headers(self) -> Dict[str, str]:
+        """Return the auth headers sent with every request."""
         pass
-    
-    def _check_cache(self, key: str) -> Optional[Dict[str, Any]]:
-        """Check if cached data is available and valid."""
-        if key in self.cache:
-            cached_data, timestamp = self.cache[key]
-            if time.time() - timestamp < self.cache_ttl:
-                return cached_data
-        return None
-    
-    def _update_cache(self, key: str, data: Dict[str, Any]):
-        """Update cache with new data."""
-        self.cache[key] = (data, time.time())
 
+    @abstractmethod
+    def _request(self, ip_address: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Return (url, params) for an IP lookup."""
+        pass
+
+    @abstractmethod
+    def _parse(self, ip_address: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a 200-response payload into the provider's result dict."""
+        pass
 
-class AbuseIPDBProvider(ThreatIntelProvider):
-    """AbuseIPDB threat intelligence provider."""
-    
-    BASE_URL = "https://api.abuseipdb.com/api/v2"
-    
     def lookup_ip(self, ip_address: str) -> Dict[str, Any]:
         """
-        Lookup IP on AbuseIPDB.
-        
+        Lookup IP reputation.
+
         Args:
-            ip_address: IP address to check
-            
+            ip_address: IP address to lookup
+
         Returns:
-            Reputation data including abuse confidence score
+            Threat intelligence data
         """
-        # Check cache
         cached = self._check_cache(ip_address)
         if cached:
-            self.logger.debug(f"Using cached AbuseIPDB data for {ip_address}")
+            self.logger.debug(f"Using cached {self.PROVIDER_NAME} data for {ip_address}")
             return cached
-        
+
+        url, params = self._request(ip_address)
+        cond_headers, stale = self._conditional_headers(ip_address)
+        self.bucket.acquire()
+
         try:
-            headers = {
-                'Key': self.api_key,
-                'Accept': 'application/json'
-            }
-            
-            params = {
-                'ipAddress': ip_address,
-                'maxAgeInDays': self.config.get('max_age_days', 90),
-                'verbose': ''
-            }
-            
-            response = requests.get(
-                f"{self.BASE_URL}/check",
-                headers=headers,
+            response = self.session.get(
+                url,
                 params=params,
+                headers=cond_headers,
                 timeout=self.config.get('timeout', 10)
             )
-            
+
+            if response.status_code == 304 and stale is not None:
+                # Upstream unchanged: refresh the stale entry without
+                # transferring or parsing the payload again
+                self._update_cache(ip_address, stale)
+                return stale
+
             if response.status_code == 200:
-                data = response.json()
-                result = {
-                    'provider': 'abuseipdb',
-                    'ip': ip_address,
-                    'abuse_confidence_score': data.get('data', {}).get('abuseConfidenceScore', 0),
-                    'country_code': data.get('data', {}).get('countryCode', 'Unknown'),
-                    'usage_type': data.get('data', {}).get('usageType', 'Unknown'),
-                    'isp': data.get('data', {}).get('isp', 'Unknown'),
-                    'domain': data.get('data', {}).get('domain', 'Unknown'),
-                    'total_reports': data.get('data', {}).get('totalReports', 0),
-                    'is_public': data.get('data', {}).get('isPublic', True),
-                    'is_whitelisted': data.get('data', {}).get('isWhitelisted', False)
-                }
-                
+                result = self._parse(ip_address, response.json())
                 self._update_cache(ip_address, result)
+                self._store_validators(ip_address, response.headers, result)
                 return result
             else:
-                self.logger.error(f"AbuseIPDB API error: {response.status_code}")
-                return {'provider': 'abuseipdb', 'ip': ip_address, 'error': f"HTTP {response.status_code}"}
-        
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"AbuseIPDB request failed: {e}")
-            return {'provider': 'abuseipdb', 'ip': ip_address, 'error': str(e)}
+                if response.status_code == 429:
+                    self._handle_rate_limited(response.headers.get('Retry-After'))
+                self.logger.error(f"{self.PROVIDER_NAME} API error: {response.status_code}")
+                return {'provider': self.PROVIDER_NAME, 'ip': ip_address, 'error': f"HTTP {response.status_code}"}
 
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"{self.PROVIDER_NAME} request failed: {e}")
+            return {'provider': self.PROVIDER_NAME, 'ip': ip_address, 'error': str(e)}
 
-class VirusTotalProvider(ThreatIntelProvider):
-    """VirusTotal threat intelligence provider."""
-    
-    BASE_URL = "https://www.virustotal.com/api/v3"
-    
-    def lookup_ip(self, ip_address: str) -> Dict[str, Any]:
+    async def lookup_ip_async(self, ip_address: str) -> Dict[str, Any]:
         """
-        Lookup IP on VirusTotal.
-        
+        Lookup IP reputation without blocking the event loop.
+
+        Uses the shared per-loop aiohttp session so concurrent lookups
+        overlap their network round-trips instead of queueing behind one
+        another.
+
         Args:
-            ip_address: IP address to check
-            
+            ip_address: IP address to lookup
+
         Returns:
-            Reputation data including malicious detections
+            Threat intelligence data
         """
-        # Check cache
         cached = self._check_cache(ip_address)
         if cached:
-            self.logger.debug(f"Using cached VirusTotal data for {ip_address}")
+            self.logger.debug(f"Using cached {self.PROVIDER_NAME} data for {ip_address}")
             return cached
-        
+
+        url, params = self._request(ip_address)
+        cond_headers, stale = self._conditional_headers(ip_address)
+        headers = dict(self._headers)
+        if cond_headers:
+            headers.update(cond_headers)
+        await self.bucket.acquire_async()
+
         try:
-            headers = {
-                'x-apikey': self.api_key
-            }
-            
-            response = requests.get(
-                f"{self.BASE_URL}/ip_addresses/{ip_address}",
+            session = _get_session()
+            async with session.get(
+                url,
                 headers=headers,
-                timeout=self.config.get('timeout', 10)
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                attributes = data.get('data', {}).get('attributes', {})
-                stats = attributes.get('last_analysis_stats', {})
-                
-                result = {
-                    'provider': 'virustotal',
-                    'ip': ip_address,
-                    'malicious': stats.get('malicious', 0),
-                    'suspicious': stats.get('suspicious', 0),
-                    'harmless': stats.get('harmless', 0),
-                    'undetected': stats.get('undetected', 0),
-                    'reputation': attributes.get('reputation', 0),
-                    'country': attributes.get('country', 'Unknown'),
-                    'asn': attributes.get('asn', 'Unknown'),
-                    'as_owner': attributes.get('as_owner', 'Unknown'),
-                    'network': attributes.get('network', 'Unknown')
-                }
-                
-                self._update_cache(ip_address, result)
-                return result
-            else:
-                self.logger.error(f"VirusTotal API error: {response.status_code}")
-                return {'provider': 'virustotal', 'ip': ip_address, 'error': f"HTTP {response.status_code}"}
-        
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"VirusTotal request failed: {e}")
-            return {'provider': 'virustotal', 'ip': ip_address, 'error': str(e)}
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=self.config.get('timeout', 10))
+            ) as response:
+                if response.status == 304 and stale is not None:
+                    self._update_cache(ip_address, stale)
+                    return stale
+                if response.status == 200:
+                    result = self._parse(ip_address, await response.json())
+                    self._update_cache(ip_address, result)
+                    self._store_validators(ip_address, response.headers, result)
+                    return result
+                if response.status == 429:
+                    self._handle_rate_limited(response.headers.get('Retry-After'))
+                self.logger.error(f"{self.PROVIDER_NAME} API error: {response.status}")
+                return {'provider': self.PROVIDER_NAME, 'ip': ip_address, 'error': f"HTTP {response.status}"}
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"{self.PROVIDER_NAME} request failed: {e}")
+            return {'provider': self.PROVIDER_NAME, 'ip': ip_address, 'error': str(e)}
+
+    def lookup_ips(self, ips: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Lookup a batch of IPs in one dispatch.
+
+        The base implementation overlaps the lookups on one event loop
+        through the shared pooled session when aiohttp is available, so
+        a chunk costs roughly a single round-trip, and falls back to
+        serial sync lookups otherwise. Providers whose API exposes a
+        true bulk endpoint can override this.
+
+        Args:
+            ips: IP addresses to lookup
+
+        Returns:
+            Mapping of IP address to threat intelligence data
+        """
+        if _AIOHTTP_AVAILABLE:
+            async def _gather():
+                return await asyncio.gather(
+                    *(self.lookup_ip_async(ip) for ip in ips)
+                )
+            return dict(zip(ips, _run(_gather())))
+        return {ip: self.lookup_ip(ip) for ip in ips}
+
+    def _handle_rate_limited(self, retry_after: Optional[str]):
+        """Drain the bucket so the next call waits out a 429.
+
+        Without this, every event retries immediately and amplifies the
+        flood; honoring Retry-After (or one fill interval when absent)
+        turns cascading 429s into a single smooth backoff.
+        """
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = self.RATE_PERIOD / self.RATE_LIMIT
+        self.bucket.penalize(delay)
+        self.logger.warning(f"{self.PROVIDER_NAME} rate limited; backing off {delay:.0f}s")
+
+    def _conditional_headers(self, key: str) -> Tuple[Optional[Dict[str, str]], Optional[Dict[str, Any]]]:
+        """Return (revalidation headers, stale payload) for an expired key."""
+        with self._cache_lock:
+            entry = self._validators.get(key)
+        if entry is None:
+            return None, None
+        etag, last_modified, stale = entry
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return (headers or None), stale
+
+    def _store_validators(self, key: str, response_headers, data: Dict[str, Any]):
+        """Remember a response's ETag/Last-Modified alongside its payload."""
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if etag or last_modified:
+            with self._cache_lock:
+                self._validators[key] = (etag, last_modified, data)
+
+    def _check_cache(self, key: str) -> Optional[Dict[str, Any]]:
+        """Check if cached data is available and valid."""
+        with self._cache_lock:
+            return self.cache.get(key)
+
+    def _update_cache(self, key: str, data: Dict[str, Any]):
+        """Update cache with new data, expiring by the result's verdict."""
+        with self._cache_lock:
+            self.cache.set(key, data, ttl=self._ttl_for(data))
+
+    def _ttl_for(self, result: Dict[str, Any]) -> Optional[float]:
+        """Freshness lifetime for a lookup result, in seconds.
+
+        Clean IPs are stable and safe to cache for a day — raising the
+        hit ratio on the long tail — while high-confidence malicious
+        verdicts can flip after a takedown and are refreshed sooner.
+        Providers override this with their own signal; None means the
+        configured default TTL.
+        """
+        return None
+
+
+class AbuseIPDBProvider(ThreatIntelProvider):
+    """AbuseIPDB threat intelligence provider."""
+
+    PROVIDER_NAME = 'abuseipdb'
+    BASE_URL = "https://api.abuseipdb.com/api/v2"
+
+    # Free tier: 1000 checks per day
+    RATE_LIMIT = 1000
+    RATE_PERIOD = 86400.0
+
+    def _default_headers(self) -> Dict[str, str]:
+        return {
+            'Key': self.api_key,
+            'Accept': 'application/json'
+        }
+
+    def _request(self, ip_address: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        params = {
+            'ipAddress': ip_address,
+            'maxAgeInDays': self.config.get('max_age_days', 90),
+            'verbose': ''
+        }
+        return f"{self.BASE_URL}/check", params
+
+    def _ttl_for(self, result: Dict[str, Any]) -> Optional[float]:
+        score = result.get('abuse_confidence_score', 0)
+        if score < 10:
+            return 86400
+        if score < 75:
+            return 1800
+        return 600
+
+    def _parse(self, ip_address: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'provider': 'abuseipdb',
+            'ip': ip_address,
+            'abuse_confidence_score': data.get('data', {}).get('abuseConfidenceScore', 0),
+            'country_code': data.get('data', {}).get('countryCode', 'Unknown'),
+            'usage_type': data.get('data', {}).get('usageType', 'Unknown'),
+            'isp': data.get('data', {}).get('isp', 'Unknown'),
+            'domain': data.get('data', {}).get('domain', 'Unknown'),
+            'total_reports': data.get('data', {}).get('totalReports', 0),
+            'is_public': data.get('data', {}).get('isPublic', True),
+            'is_whitelisted': data.get('data', {}).get('isWhitelisted', False)
+        }
+
+
+class VirusTotalProvider(ThreatIntelProvider):
+    """VirusTotal threat intelligence provider."""
+
+    PROVIDER_NAME = 'virustotal'
+    BASE_URL = "https://www.virustotal.com/api/v3"
+
+    # Public API: 4 requests per minute
+    RATE_LIMIT = 4
+    RATE_PERIOD = 60.0
+
+    def _default_headers(self) -> Dict[str, str]:
+        return {
+            'x-apikey': self.api_key
+        }
+
+    def _request(self, ip_address: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        return f"{self.BASE_URL}/ip_addresses/{ip_address}", None
+
+    def _ttl_for(self, result: Dict[str, Any]) -> Optional[float]:
+        flagged = result.get('malicious', 0) + result.get('suspicious', 0)
+        if flagged == 0:
+            return 86400
+        if flagged < 5:
+            return 1800
+        return 600
+
+    def _parse(self, ip_address: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        attributes = data.get('data', {}).get('attributes', {})
+        stats = attributes.get('last_analysis_stats', {})
+        return {
+            'provider': 'virustotal',
+            'ip': ip_address,
+            'malicious': stats.get('malicious', 0),
+            'suspicious': stats.get('suspicious', 0),
+            'harmless': stats.get('harmless', 0),
+            'undetected': stats.get('undetected', 0),
+            'reputation': attributes.get('reputation', 0),
+            'country': attributes.get('country', 'Unknown'),
+            'asn': attributes.get('asn', 'Unknown'),
+            'as_owner': attributes.get('as_owner', 'Unknown'),
+            'network': attributes.get('network', 'Unknown')
+        }
 
 
 class ThreatIntelligence:
     """Threat intelligence aggregator."""
-    
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize threat intelligence.
-        
+
         Args:
             config: Configuration dictionary
         """
         self.config = config.get('threat_intel', {})
         self.logger = LoggerFactory.get_logger('ThreatIntelligence')
         self.providers = []
-        
+
         # Initialize providers
         if self.config.get('enabled', False):
             self._init_providers()
-    
+
     def _init_providers(self):
         """Initialize configured providers."""
         # AbuseIPDB
@@ -209,7 +613,7 @@ class ThreatIntelligence:
                 provider = AbuseIPDBProvider(api_key, abuseipdb_config)
                 self.providers.append(provider)
                 self.logger.info("AbuseIPDB provider initialized")
-        
+
         # VirusTotal
         virustotal_config = self.config.get('virustotal', {})
         if virustotal_config.get('enabled', False):
@@ -218,74 +622,157 @@ class ThreatIntelligence:
                 provider = VirusTotalProvider(api_key, virustotal_config)
                 self.providers.append(provider)
                 self.logger.info("VirusTotal provider initialized")
-    
+
     def enrich_detection(self, detection: Dict[str, Any]) -> Dict[str, Any]:
         """
         Enrich detection with threat intelligence.
-        
+
+        Must not be called from inside a running event loop; async
+        callers should use enrich_detection_async directly.
+
+        Args:
+            detection: Detection dictionary
+
+        Returns:
+            Enriched detection with threat data
+        """
+        return self.enrich_batch([detection])[0]
+
+    def enrich_batch(self, detections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Enrich a batch of detections with threat intelligence.
+
+        Unique src/dst IPs across the whole batch are collected once,
+        chunked, and dispatched per provider through lookup_ips, so a
+        stream of detections sharing hot IPs pays one lookup per IP
+        instead of one per detection. Results are fanned back out to
+        each detection.
+
+        Args:
+            detections: Detection dictionaries to enrich in place
+
+        Returns:
+            The enriched detections
+        """
+        if not self.providers or not detections:
+            return detections
+
+        ips = set()
+        for detection in detections:
+            for key in ('src_ip', 'dst_ip'):
+                ip = detection.get(key)
+                if ip:
+                    ips.add(ip)
+
+        # Private/reserved addresses short-circuit to a stub before any
+        # cache or network activity
+        intel: Dict[str, Dict[str, Any]] = {}
+        for ip in ips:
+            if _is_lookupable(ip):
+                intel[ip] = {}
+            else:
+                intel[ip] = {
+                    provider.PROVIDER_NAME: {'provider': provider.PROVIDER_NAME, 'ip': ip, 'skipped': 'private'}
+                    for provider in self.providers
+                }
+
+        ip_list = sorted(ip for ip in ips if _is_lookupable(ip))
+        for start in range(0, len(ip_list), _BATCH_SIZE):
+            chunk = ip_list[start:start + _BATCH_SIZE]
+            for provider in self.providers:
+                try:
+                    by_ip = provider.lookup_ips(chunk)
+                except Exception as e:
+                    self.logger.error(f"Provider {provider.__class__.__name__} batch lookup failed: {e}")
+                    continue
+                for ip, result in by_ip.items():
+                    intel[ip][provider.PROVIDER_NAME] = result
+
+        for detection in detections:
+            threat_data = {}
+            src_ip = detection.get('src_ip')
+            dst_ip = detection.get('dst_ip')
+            if src_ip:
+                threat_data['src_threat_intel'] = intel.get(src_ip, {})
+            if dst_ip:
+                threat_data['dst_threat_intel'] = intel.get(dst_ip, {})
+            self._apply_threat_data(detection, threat_data)
+
+        return detections
+
+    async def enrich_detection_async(self, detection: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Enrich detection with threat intelligence, all lookups concurrent.
+
         Args:
             detection: Detection dictionary
-            
+
         Returns:
             Enriched detection with threat data
         """
         if not self.providers:
             return detection
-        
+
         src_ip = detection.get('src_ip')
         dst_ip = detection.get('dst_ip')
-        
-        threat_data = {}
-        
-        # Lookup source IP
+
+        # Fire every (ip, provider) lookup in one gather
+        tasks = {}
         if src_ip:
-            threat_data['src_threat_intel'] = self._lookup_ip_all_providers(src_ip)
-        
-        # Lookup destination IP
+            tasks['src_threat_intel'] = self._lookup_all_async(src_ip)
         if dst_ip:
-            threat_data['dst_threat_intel'] = self._lookup_ip_all_providers(dst_ip)
-        
-        # Add threat data to detection
+            tasks['dst_threat_intel'] = self._lookup_all_async(dst_ip)
+
+        looked_up = await asyncio.gather(*tasks.values())
+        threat_data = dict(zip(tasks.keys(), looked_up))
+
+        return self._apply_threat_data(detection, threat_data)
+
+    def _apply_threat_data(self, detection: Dict[str, Any], threat_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach threat data and the aggregate score to a detection."""
         detection['threat_intel'] = threat_data
-        
-        # Calculate threat score
         detection['threat_score'] = self._calculate_threat_score(threat_data)
-        
         return detection
-    
-    def _lookup_ip_all_providers(self, ip_address: str) -> Dict[str, Any]:
-        """Lookup IP across all providers."""
+
+    async def _lookup_all_async(self, ip_address: str) -> Dict[str, Any]:
+        """Lookup IP across all providers concurrently."""
+        if not _is_lookupable(ip_address):
+            return {
+                provider.PROVIDER_NAME: {'provider': provider.PROVIDER_NAME, 'ip': ip_address, 'skipped': 'private'}
+                for provider in self.providers
+            }
+        looked_up = await asyncio.gather(
+            *(provider.lookup_ip_async(ip_address) for provider in self.providers),
+            return_exceptions=True
+        )
+
         results = {}
-        
-        for provider in self.providers:
-            try:
-                result = provider.lookup_ip(ip_address)
-                provider_name = provider.__class__.__name__.replace('Provider', '').lower()
-                results[provider_name] = result
-            except Exception as e:
-                self.logger.error(f"Provider {provider.__class__.__name__} lookup failed: {e}")
-        
+        for provider, result in zip(self.providers, looked_up):
+            if isinstance(result, Exception):
+                self.logger.error(f"Provider {provider.__class__.__name__} lookup failed: {result}")
+            else:
+                results[provider.PROVIDER_NAME] = result
         return results
-    
+
     def _calculate_threat_score(self, threat_data: Dict[str, Any]) -> float:
         """
         Calculate aggregate threat score.
-        
+
         Args:
             threat_data: Threat intelligence data
-            
+
         Returns:
             Threat score between 0-100
         """
         scores = []
-        
+
         # Source IP threats
         src_intel = threat_data.get('src_threat_intel', {})
-        
+
         if 'abuseipdb' in src_intel:
             abuse_score = src_intel['abuseipdb'].get('abuse_confidence_score', 0)
             scores.append(abuse_score)
-        
+
         if 'virustotal' in src_intel:
             vt_malicious = src_intel['virustotal'].get('malicious', 0)
             vt_suspicious = src_intel['virustotal'].get('suspicious', 0)
@@ -293,19 +780,19 @@ class ThreatIntelligence:
                 # Normalize to 0-100 scale
                 vt_score = min(100, (vt_malicious * 10 + vt_suspicious * 5))
                 scores.append(vt_score)
-        
+
         # Destination IP threats (weighted lower)
         dst_intel = threat_data.get('dst_threat_intel', {})
-        
+
         if 'abuseipdb' in dst_intel:
             abuse_score = dst_intel['abuseipdb'].get('abuse_confidence_score', 0)
             scores.append(abuse_score * 0.5)
-        
+
         if 'virustotal' in dst_intel:
             vt_malicious = dst_intel['virustotal'].get('malicious', 0)
             if vt_malicious > 0:
                 vt_score = min(100, vt_malicious * 5)
                 scores.append(vt_score * 0.5)
-        
+
         # Return average score
         return sum(scores) / len(scores) if scores else 0.0
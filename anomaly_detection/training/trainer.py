@@ -2,15 +2,58 @@
 Model training module with comprehensive training pipeline.
 """
 
+import gc
 import numpy as np
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import os
+from concurrent.futures import ThreadPoolExecutor
+from joblib import Parallel, delayed
+from ..models.memmap_cache import as_memmap
 from ..models.supervised_models import SupervisedModels
 from ..models.unsupervised_models import UnsupervisedModels
 from ..models.neural_networks import AutoEncoder, LSTMDetector, DNNClassifier
 from ..utils.logger import LoggerFactory
 
 
+def _train_one_supervised(
+    config: Dict[str, Any],
+    model_name: str,
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    save_path: str
+) -> Tuple[str, str, Optional[str]]:
+    """Train and save one supervised model in a worker process.
+
+    Top-level so loky can pickle it; a fresh collection is built per
+    worker since estimators don't cross process boundaries untrained.
+    Errors come back as strings so one failed fit doesn't cancel the
+    rest of the batch.
+    """
+    try:
+        collection = SupervisedModels(config)
+        collection.train(model_name, X_train, y_train)
+        collection.save_model(model_name, save_path)
+        return model_name, save_path, None
+    except Exception as e:
+        return model_name, save_path, str(e)
+
+
+def _train_one_unsupervised(
+    config: Dict[str, Any],
+    model_name: str,
+    X_train: np.ndarray,
+    save_path: str
+) -> Tuple[str, str, Optional[str]]:
+    """Train and save one unsupervised model in a worker process."""
+    try:
+        collection = UnsupervisedModels(config)
+        collection.train(model_name, X_train)
+        collection.save_model(model_name, save_path)
+        return model_name, save_path, None
+    except Exception as e:
+        return model_name, save_path, str(e)
+
+
 class ModelTrainer:
     """Unified trainer for all model types."""
     
@@ -32,7 +75,11 @@ class ModelTrainer:
         self.unsupervised_models = UnsupervisedModels(unsupervised_config)
         self.neural_models = {}
         
-        self.save_dir = config.get('model_storage', {}).get('save_dir', 'saved_models')
+        storage_config = config.get('model_storage', {})
+        self.save_dir = storage_config.get('save_dir', 'saved_models')
+        # Drop trained models from memory once their joblib file is
+        # written — for train-and-exit pipelines that never predict
+        self.evict_after_save = storage_config.get('evict_after_save', False)
     
     def train_supervised_model(
         self,
@@ -55,6 +102,8 @@ class ModelTrainer:
         save_path = os.path.join(self.save_dir, 'supervised', f'{model_name}.joblib')
         self.supervised_models.save_model(model_name, save_path)
         self.logger.info(f"Model saved: {save_path}")
+        if self.evict_after_save:
+            self.supervised_models.models.pop(model_name, None)
     
     def train_unsupervised_model(
         self,
@@ -75,6 +124,8 @@ class ModelTrainer:
         save_path = os.path.join(self.save_dir, 'unsupervised', f'{model_name}.joblib')
         self.unsupervised_models.save_model(model_name, save_path)
         self.logger.info(f"Model saved: {save_path}")
+        if self.evict_after_save:
+            self.unsupervised_models.models.pop(model_name, None)
     
     def train_autoencoder(
         self,
@@ -138,14 +189,30 @@ class ModelTrainer:
             X_train: Training features
             y_train: Training labels
         """
-        model_names = ['random_forest', 'gradient_boosting', 'svm', 
+        model_names = ['random_forest', 'gradient_boosting', 'svm',
                       'logistic_regression', 'decision_tree']
-        
-        for model_name in model_names:
-            try:
-                self.train_supervised_model(model_name, X_train, y_train)
-            except Exception as e:
-                self.logger.error(f"Error training {model_name}: {str(e)}")
+
+        # One loky worker per model: the fits are independent and
+        # CPU-bound, so they run on separate cores instead of serially.
+        # Estimators' own joblib parallelism nests inside the workers
+        # (falling back to sequential there). X_train is spilled to a
+        # shared memmap up front, so every worker opens the same file
+        # by path instead of receiving its own pickled copy.
+        X_train = as_memmap(X_train)
+        jobs = [
+            (name, os.path.join(self.save_dir, 'supervised', f'{name}.joblib'))
+            for name in model_names
+        ]
+        results = Parallel(
+            n_jobs=min(len(jobs), os.cpu_count() or 1),
+            backend='loky'
+        )(
+            delayed(_train_one_supervised)(
+                self.supervised_models.config, name, X_train, y_train, path
+            )
+            for name, path in jobs
+        )
+        self._collect_trained(self.supervised_models, results)
     
     def train_all_unsupervised(
         self,
@@ -158,12 +225,34 @@ class ModelTrainer:
             X_train: Training features
         """
         model_names = ['isolation_forest', 'kmeans', 'dbscan', 'lof']
-        
-        for model_name in model_names:
+
+        X_train = as_memmap(X_train)
+        jobs = [
+            (name, os.path.join(self.save_dir, 'unsupervised', f'{name}.joblib'))
+            for name in model_names
+        ]
+        results = Parallel(
+            n_jobs=min(len(jobs), os.cpu_count() or 1),
+            backend='loky'
+        )(
+            delayed(_train_one_unsupervised)(
+                self.unsupervised_models.config, name, X_train, path
+            )
+            for name, path in jobs
+        )
+        self._collect_trained(self.unsupervised_models, results)
+
+    def _collect_trained(self, collection, results: List[Tuple[str, str, Optional[str]]]):
+        """Load worker-trained models back into a collection."""
+        for model_name, save_path, error in results:
+            if error:
+                self.logger.error(f"Error training {model_name}: {error}")
+                continue
             try:
-                self.train_unsupervised_model(model_name, X_train)
+                collection.load_model(model_name, save_path)
+                self.logger.info(f"Model saved: {save_path}")
             except Exception as e:
-                self.logger.error(f"Error training {model_name}: {str(e)}")
+                self.logger.error(f"Error loading trained {model_name}: {str(e)}")
     
     def train_all_models(
         self,
@@ -186,51 +275,76 @@ class ModelTrainer:
         # Train supervised models
         self.logger.info("Training supervised models...")
         self.train_all_supervised(X_train, y_train)
-        
+        self._release_stage_memory()
+
         # Train unsupervised models
         self.logger.info("Training unsupervised models...")
         self.train_all_unsupervised(X_train)
-        
+        self._release_stage_memory()
+
         # Train neural networks
         self.logger.info("Training neural networks...")
         try:
             self.train_autoencoder(X_train, X_val)
         except Exception as e:
             self.logger.error(f"Error training autoencoder: {str(e)}")
-        
+        self._release_stage_memory()
+
         try:
             self.train_dnn(X_train, y_train, X_val, y_val)
         except Exception as e:
             self.logger.error(f"Error training DNN: {str(e)}")
-        
+        self._release_stage_memory()
+
         self.logger.info("All model training complete!")
+
+    def _release_stage_memory(self):
+        """Drop per-stage garbage between training stages.
+
+        Fit intermediates (worker pickles, boolean masks, Keras graph
+        state) otherwise accumulate until the cyclic collector happens
+        to run, so peak RSS across the three stages is their sum rather
+        than their max.
+        """
+        gc.collect()
+        try:
+            import tensorflow as tf
+            tf.keras.backend.clear_session()
+        except Exception:
+            pass
     
     def load_models(self):
-        """Load all saved models."""
+        """Load all saved models.
+
+        Loads overlap on a thread pool: joblib.load is dominated by
+        disk reads and decompression that release the GIL, so a cold
+        start pays roughly one storage round-trip instead of nine.
+        """
         self.logger.info("Loading saved models...")
-        
-        # Load supervised models
-        supervised_dir = os.path.join(self.save_dir, 'supervised')
-        if os.path.exists(supervised_dir):
-            for model_file in os.listdir(supervised_dir):
-                if model_file.endswith('.joblib'):
-                    model_name = model_file.replace('.joblib', '')
-                    model_path = os.path.join(supervised_dir, model_file)
-                    try:
-                        self.supervised_models.load_model(model_name, model_path)
-                    except Exception as e:
-                        self.logger.error(f"Error loading {model_name}: {str(e)}")
-        
-        # Load unsupervised models
-        unsupervised_dir = os.path.join(self.save_dir, 'unsupervised')
-        if os.path.exists(unsupervised_dir):
-            for model_file in os.listdir(unsupervised_dir):
+
+        # Collect every (collection, name, path) first, then load concurrently
+        jobs = []
+        for collection, subdir in (
+            (self.supervised_models, 'supervised'),
+            (self.unsupervised_models, 'unsupervised')
+        ):
+            model_dir = os.path.join(self.save_dir, subdir)
+            if not os.path.exists(model_dir):
+                continue
+            for model_file in os.listdir(model_dir):
                 if model_file.endswith('.joblib'):
                     model_name = model_file.replace('.joblib', '')
-                    model_path = os.path.join(unsupervised_dir, model_file)
-                    try:
-                        self.unsupervised_models.load_model(model_name, model_path)
-                    except Exception as e:
-                        self.logger.error(f"Error loading {model_name}: {str(e)}")
-        
+                    jobs.append((collection, model_name, os.path.join(model_dir, model_file)))
+
+        def _load_one(job):
+            collection, model_name, model_path = job
+            try:
+                collection.load_model(model_name, model_path)
+            except Exception as e:
+                self.logger.error(f"Error loading {model_name}: {str(e)}")
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as executor:
+                list(executor.map(_load_one, jobs))
+
         self.logger.info("Model loading complete!")
\ No newline at end of file
@@ -19,6 +19,26 @@ CORS(app)
 # Database path
 DB_PATH = os.path.join(os.path.dirname(__file__), 'data', 'detections.db')
 
+# raw_packet may be zstd-compressed bytes (newer rows) or plain JSON text
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+try:
+    import zstandard as zstd
+    _zstd_decompressor = zstd.ZstdDecompressor()
+except ImportError:
+    _zstd_decompressor = None
+
+
+def raw_packet_text(value) -> str:
+    """Return the raw_packet column as text, decompressing when needed"""
+    if isinstance(value, bytes):
+        if _zstd_decompressor is not None and value[:4] == _ZSTD_MAGIC:
+            try:
+                return _zstd_decompressor.decompress(value).decode('utf-8', 'replace')
+            except Exception:
+                return ''
+        return value.decode('utf-8', 'replace')
+    return value or ''
+
 # Hostname cache
 _hostname_cache = {}
 _hostname_cache_lock = threading.Lock()
@@ -223,7 +243,7 @@ def get_detections_by_type():
         
         for row in rows:
             attack_type = classify_attack_type(
-                row['raw_packet'], 
+                raw_packet_text(row['raw_packet']),
                 row['protocol'], 
                 row['anomaly_score']
             )
@@ -83,5 +83,45 @@ def test_detection_rate_calculation():
     assert 0 <= rates['false_alarm_rate'] <= 1
 
 
+def test_evaluator_matches_sklearn():
+    """Test evaluate_model agrees with sklearn on random 0/1 labels."""
+    from sklearn.metrics import (
+        accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
+    )
+
+    rng = np.random.default_rng(42)
+    y_true = rng.integers(0, 2, 1000)
+    y_pred = rng.integers(0, 2, 1000)
+
+    evaluator = ModelEvaluator()
+    metrics = evaluator.evaluate_model(y_true, y_pred, model_name='random')
+
+    assert metrics['accuracy'] == pytest.approx(accuracy_score(y_true, y_pred))
+    assert metrics['precision'] == pytest.approx(precision_score(y_true, y_pred, zero_division=0))
+    assert metrics['recall'] == pytest.approx(recall_score(y_true, y_pred, zero_division=0))
+    assert metrics['f1_score'] == pytest.approx(f1_score(y_true, y_pred, zero_division=0))
+    assert (metrics['confusion_matrix'] == confusion_matrix(y_true, y_pred)).all()
+
+
+def test_evaluator_handles_minus_one_labels():
+    """Test -1/1 labels (IsolationForest's raw convention) stay correct."""
+    from sklearn.metrics import accuracy_score, confusion_matrix
+
+    rng = np.random.default_rng(42)
+    y_true = rng.choice([-1, 1], 1000)
+    y_pred = rng.choice([-1, 1], 1000)
+
+    evaluator = ModelEvaluator()
+    metrics = evaluator.evaluate_model(y_true, y_pred, model_name='raw_if')
+
+    assert metrics['accuracy'] == pytest.approx(accuracy_score(y_true, y_pred))
+    assert (metrics['confusion_matrix'] == confusion_matrix(y_true, y_pred)).all()
+
+    rates = evaluator.calculate_detection_rate(y_true, y_pred)
+    tn, fp, fn, tp = confusion_matrix(y_true, y_pred).ravel()
+    assert rates['detected_anomalies'] == tp
+    assert rates['total_normal'] == tn + fp
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
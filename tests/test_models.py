@@ -2,8 +2,12 @@
 Tests for model modules.
 """
 
+import gc
+import os
+
 import pytest
 import numpy as np
+from anomaly_detection.models import memmap_cache
 from anomaly_detection.models.supervised_models import SupervisedModels
 from anomaly_detection.models.unsupervised_models import UnsupervisedModels
 
@@ -75,5 +79,45 @@ def test_unsupervised_model_training():
     assert all(p in [0, 1] for p in predictions)
 
 
+def test_memmap_cache_hits_same_object():
+    """Test repeat as_memmap calls with the same array reuse one spill."""
+    X = np.full((600, 600), 7.0)
+
+    mapped = memmap_cache.as_memmap(X)
+
+    assert isinstance(mapped, np.memmap)
+    assert float(mapped[0, 0]) == 7.0
+    assert memmap_cache.as_memmap(X) is mapped
+
+
+def test_memmap_cache_evicts_on_source_collection():
+    """Test cache entry and temp file go away with the source array."""
+    X = np.full((600, 600), 7.0)
+    memmap_cache.as_memmap(X)
+    key = (X.__array_interface__['data'][0], X.shape, X.dtype.str)
+    path = memmap_cache._files[key]
+
+    del X
+    gc.collect()
+
+    assert key not in memmap_cache._cache
+    assert not os.path.exists(path)
+
+
+def test_memmap_cache_pointer_reuse_not_aliased():
+    """Test a stale entry at a reused address is evicted, not served."""
+    X = np.full((600, 600), 1.0)
+    key = (X.__array_interface__['data'][0], X.shape, X.dtype.str)
+
+    # Plant a stale entry at X's address whose source is already dead,
+    # as if the allocator reused the pointer before the finalizer ran
+    memmap_cache._cache[key] = np.full((600, 600), 99.0)
+    memmap_cache._sources[key] = lambda: None
+
+    mapped = memmap_cache.as_memmap(X)
+
+    assert float(mapped[0, 0]) == 1.0
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
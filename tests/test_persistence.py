@@ -0,0 +1,65 @@
+"""
+Tests for persistence and report export modules.
+"""
+
+import csv
+import os
+
+import pytest
+from anomaly_detection.persistence.db import DatabaseManager, raw_packet_text
+from anomaly_detection.reporting.report_generator import ReportGenerator
+
+
+def test_raw_packet_text_passthrough():
+    """Test raw_packet_text on uncompressed values."""
+    assert raw_packet_text('plain text row') == 'plain text row'
+    assert raw_packet_text(b'plain bytes row') == 'plain bytes row'
+    assert raw_packet_text(None) is None
+
+
+def test_raw_packet_text_zstd_round_trip():
+    """Test raw_packet_text decompresses zstd-compressed packets."""
+    zstd = pytest.importorskip('zstandard')
+
+    payload = '{"src_ip": "10.0.0.1", "flags": "SYN"}'
+    compressed = zstd.ZstdCompressor(level=1).compress(payload.encode())
+
+    assert raw_packet_text(compressed) == payload
+
+
+def test_export_decodes_mixed_raw_packet_rows(tmp_path):
+    """Test CSV export with compressed and legacy plain raw_packet rows."""
+    config = {
+        'persistence': {
+            'enable_database': True,
+            'database_path': str(tmp_path / 'detections.db')
+        }
+    }
+    db = DatabaseManager(config)
+
+    # Simulate a bytes row (what log_detection writes with zstandard
+    # installed) next to a legacy plain-text row
+    conn = db.get_connection()
+    insert = (
+        "INSERT INTO detections (timestamp, source_ip, anomaly_score, "
+        "is_anomaly, severity, raw_packet) VALUES (?, ?, ?, ?, ?, ?)"
+    )
+    conn.execute(insert, ('2026-01-01T00:00:00', '10.0.0.1', 0.9, 1, 'high', b'bytes packet'))
+    conn.execute(insert, ('2026-01-01T00:00:01', '10.0.0.2', 0.1, 0, None, 'legacy packet'))
+    conn.commit()
+
+    generator = ReportGenerator(config)
+    output_path = str(tmp_path / 'report.csv')
+    result = generator._generate_export(output_path, 'csv', None, None)
+    db.close()
+
+    assert result['status'] == 'success'
+    assert result['detection_count'] == 2
+
+    with open(output_path) as f:
+        rows = list(csv.DictReader(f))
+    assert {row['raw_packet'] for row in rows} == {'bytes packet', 'legacy packet'}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])